@@ -1,6 +1,8 @@
 """Command line argument handling for the environment generator."""
 
+import socket
 import argparse
+import functools
 from urllib.parse import urlparse
 
 # Help text to display in the CLI
@@ -42,8 +44,13 @@ Notes:
         - --google-callback-url is optional and will be automatically generated based on your hostname
 """
 
+@functools.lru_cache(maxsize=1)
 def parse_arguments():
-    """Parse command line arguments."""
+    """Parse command line arguments.
+    
+    sys.argv doesn't change during a run, so the parser is only built once and
+    later calls (e.g. from renew-cert.py) get the same namespace back.
+    """
     parser = argparse.ArgumentParser(
         description='Generate environment configuration for Clio',
         epilog=HELP_TEXT,
@@ -120,5 +127,9 @@ def parse_arguments():
 
 def is_ip_address(hostname):
     """Check if the hostname is an IP address."""
-    import re
-    return bool(re.match(r'^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$', hostname))
\ No newline at end of file
+    # inet_pton only accepts four in-range octets, unlike a digits-and-dots pattern
+    try:
+        socket.inet_pton(socket.AF_INET, hostname)
+    except (OSError, ValueError):
+        return False
+    return True
\ No newline at end of file
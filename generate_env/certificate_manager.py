@@ -1,48 +1,96 @@
 """Certificate generation and management for the Clio environment."""
 
 import os
+import re
 import sys
 import shutil
 import subprocess
 import platform
+import time
 import ipaddress
 import datetime
 from pathlib import Path
-from .utils.file_operations import ensure_directory
+from .utils.file_operations import ensure_directory, link_or_copy, copy_file_atomically, write_bytes_with_mode, make_readable
+from .utils.colors import RED, GREEN, YELLOW, CYAN, RESET
+
+# Lines of the .env file that set the Let's Encrypt certificate paths
+LETSENCRYPT_ENV_RES = {
+    name: re.compile(rf'^{name}=.*$', re.MULTILINE)
+    for name in ('LETSENCRYPT_CERT_PATH', 'LETSENCRYPT_KEY_PATH')
+}
+
+# certbot output for a Let's Encrypt rate limit, and the "retry after" time it may include
+CERTBOT_RATE_LIMIT_RE = re.compile(
+    r'rateLimited|\b429\b|too many (?:certificates|new orders|failed authorizations|requests|registrations)',
+    re.IGNORECASE)
+CERTBOT_RETRY_AFTER_RE = re.compile(r'retry after (\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?: ?UTC|Z)?)', re.IGNORECASE)
+
+# Rate-limited certbot runs are retried this many times, waiting 30s, 60s, ... up to the cap
+CERTBOT_RETRIES = 2
+CERTBOT_RETRY_MAX_WAIT = 300
 
 def generate_certificates(args):
     """Generate SSL certificates based on the user's choices."""
-    print("\033[36mGenerating certificates...\033[0m")
+    print(f"{CYAN}Generating certificates...{RESET}")
     
     try:
         if args.letsencrypt:
-            print("\033[36mUsing hybrid approach with Let's Encrypt for frontend and self-signed for internal services\033[0m")
+            print(f"{CYAN}Using hybrid approach with Let's Encrypt for frontend and self-signed for internal services{RESET}")
             cert_success = get_letsencrypt_certificate_hybrid(args)
             
             if not cert_success:
-                print("\033[33mLet's Encrypt certificate generation failed, falling back to self-signed certificates\033[0m")
+                print(f"{YELLOW}Let's Encrypt certificate generation failed, falling back to self-signed certificates{RESET}")
                 generate_self_signed_certificate(args)
         elif args.self_signed:
             generate_self_signed_certificate(args)
     except Exception as e:
-        print(f"\033[31mError generating certificates: {str(e)}\033[0m")
-        print("\033[33mFalling back to self-signed certificates\033[0m")
+        print(f"{RED}Error generating certificates: {str(e)}{RESET}")
+        print(f"{YELLOW}Falling back to self-signed certificates{RESET}")
         generate_self_signed_certificate(args)
     
     # Make setup-ssl script executable on Linux/Mac
     if platform.system() != 'Windows':
         try:
             ssl_script_path = Path("backend/db/init/00-setup-ssl.sh")
-            if ssl_script_path.exists():
-                print("\033[36mMaking SSL setup script executable\033[0m")
-                os.chmod(ssl_script_path, 0o755)  # rwxr-xr-x
-                print("\033[32mSSL setup script is now executable\033[0m")
+            os.chmod(ssl_script_path, 0o755)  # rwxr-xr-x
+            print(f"{GREEN}SSL setup script is now executable{RESET}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            print(f"\033[33mWarning: Could not make SSL setup script executable: {str(e)}\033[0m")
+            print(f"{YELLOW}Warning: Could not make SSL setup script executable: {str(e)}{RESET}")
 
-def generate_self_signed_certificate(args):
-    """Generate a self-signed SSL certificate."""
-    print(f"\033[36mGenerating self-signed SSL certificate for {args.hostname}...\033[0m")
+def load_or_generate_private_key(key_path, reuse_key=False):
+    """Load the RSA key at key_path when reuse_key is set, otherwise generate a new one."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.hazmat.backends import default_backend
+    
+    if reuse_key:
+        try:
+            with open(key_path, "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None, backend=default_backend())
+            if isinstance(private_key, rsa.RSAPrivateKey) and private_key.key_size >= 2048:
+                print(f"{CYAN}Reusing existing private key {key_path}{RESET}")
+                return private_key
+            print(f"{YELLOW}Existing private key {key_path} is not a 2048+ bit RSA key, generating a new one{RESET}")
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError) as e:
+            print(f"{YELLOW}Could not load existing private key {key_path}: {str(e)}{RESET}")
+    
+    return rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048,
+        backend=default_backend()
+    )
+
+def generate_self_signed_certificate(args, reuse_key=False):
+    """Generate a self-signed SSL certificate.
+    
+    With reuse_key set (certificate renewal), the existing server.key is kept and only
+    the certificate is re-signed, which skips the RSA key generation.
+    """
+    print(f"{CYAN}Generating self-signed SSL certificate for {args.hostname}...{RESET}")
     
     # Create certs directory if it doesn't exist
     certs_dir = Path("certs")
@@ -52,7 +100,6 @@ def generate_self_signed_certificate(args):
         from cryptography import x509
         from cryptography.x509.oid import NameOID
         from cryptography.hazmat.primitives import hashes, serialization
-        from cryptography.hazmat.primitives.asymmetric import rsa
         from cryptography.hazmat.backends import default_backend
         
         # Define alternative hostnames
@@ -87,12 +134,12 @@ def generate_self_signed_certificate(args):
             except ValueError:
                 pass
         
-        # Generate a key pair
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        # Save the main server certificate and key
+        key_path = certs_dir / "server.key"
+        cert_path = certs_dir / "server.crt"
+        
+        # Generate a key pair, or keep the current one when renewing
+        private_key = load_or_generate_private_key(key_path, reuse_key)
         
         # Create a self-signed certificate
         subject = issuer = x509.Name([
@@ -122,106 +169,81 @@ def generate_self_signed_certificate(args):
             .sign(private_key, hashes.SHA256(), default_backend())
         )
         
-        # Save the main server certificate and key
-        key_path = certs_dir / "server.key"
-        cert_path = certs_dir / "server.crt"
-        
-        with open(key_path, "wb") as f:
-            f.write(private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),
-            ))
-        
-        # Set secure permissions for private key - allow read by all (needed for Docker)
-        os.chmod(key_path, 0o644)
-        
-        with open(cert_path, "wb") as f:
-            f.write(cert.public_bytes(serialization.Encoding.PEM))
-        
-        # Make certificate readable by all
-        os.chmod(cert_path, 0o644)
-        
-        # Create certificates only for the necessary services
+        # Write each PEM with one write on its own descriptor. The private key is
+        # readable by all (needed for Docker), and so is the certificate
+        write_bytes_with_mode(key_path, private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption(),
+        ), 0o644)
+        write_bytes_with_mode(cert_path, cert.public_bytes(serialization.Encoding.PEM), 0o644)
+        
+        # Create certificates only for the necessary services. They are identical to the
+        # server files, so hard link them (permissions come along with the link)
         for service in ['backend', 'db', 'redis']:
-            service_key_path = certs_dir / f"{service}.key"
-            service_cert_path = certs_dir / f"{service}.crt"
-            
-            # Copy key and set secure but readable permissions
-            with open(service_key_path, "wb") as f:
-                f.write(private_key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.TraditionalOpenSSL,
-                    encryption_algorithm=serialization.NoEncryption(),
-                ))
-            os.chmod(service_key_path, 0o644)  # Allow read by all (needed for Docker)
-            
-            # Copy certificate
-            with open(service_cert_path, "wb") as f:
-                f.write(cert.public_bytes(serialization.Encoding.PEM))
-            os.chmod(service_cert_path, 0o644)  # Allow read by all
+            link_or_copy(key_path, certs_dir / f"{service}.key")
+            link_or_copy(cert_path, certs_dir / f"{service}.crt")
         
         # For extra safety, make the entire certs directory readable by all
         if platform.system() != 'Windows':
-            os.system(f"chmod -R a+r {certs_dir}")
+            make_readable(certs_dir)
         
-        print("\033[32mSSL certificate generated successfully\033[0m")
-        print("\033[32mGenerated server.crt, server.key, and service-specific certificates with permissions 644\033[0m")
+        print(f"{GREEN}SSL certificate generated successfully{RESET}")
+        print(f"{GREEN}Generated server.crt, server.key, and service-specific certificates with permissions 644{RESET}")
         return True
         
     except ImportError:
-        print("\033[31mError: cryptography module not found. Installing required packages...\033[0m")
+        print(f"{RED}Error: cryptography module not found. Installing required packages...{RESET}")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "cryptography"])
-            print("\033[32mPackages installed successfully, retrying certificate generation...\033[0m")
+            print(f"{GREEN}Packages installed successfully, retrying certificate generation...{RESET}")
             # Retry after installing the package
-            return generate_self_signed_certificate(args)
+            return generate_self_signed_certificate(args, reuse_key)
         except Exception as e:
-            print(f"\033[31mFailed to install required packages: {str(e)}\033[0m")
+            print(f"{RED}Failed to install required packages: {str(e)}{RESET}")
             return False
     except Exception as e:
-        print(f"\033[31mError generating certificate: {str(e)}\033[0m")
+        print(f"{RED}Error generating certificate: {str(e)}{RESET}")
         return False
 
 def update_env_with_letsencrypt_paths(cert_path, key_path):
     """Update the .env file with Let's Encrypt certificate paths"""
     env_path = '.env'
-    if os.path.exists(env_path):
-        # Read existing .env file
+    try:
         with open(env_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Update or add the LETSENCRYPT_CERT_PATH and LETSENCRYPT_KEY_PATH variables
-        cert_updated = False
-        key_updated = False
-        
-        for i, line in enumerate(lines):
-            if line.startswith('LETSENCRYPT_CERT_PATH='):
-                lines[i] = f'LETSENCRYPT_CERT_PATH={cert_path}\n'
-                cert_updated = True
-            elif line.startswith('LETSENCRYPT_KEY_PATH='):
-                lines[i] = f'LETSENCRYPT_KEY_PATH={key_path}\n'
-                key_updated = True
-        
-        if not cert_updated:
-            lines.append(f'LETSENCRYPT_CERT_PATH={cert_path}\n')
-        if not key_updated:
-            lines.append(f'LETSENCRYPT_KEY_PATH={key_path}\n')
-        
-        # Write updated .env file
-        with open(env_path, 'w') as f:
-            f.writelines(lines)
-        
-        print("\033[32mUpdated .env file with Let's Encrypt certificate paths\033[0m")
+            content = f.read()
+    except FileNotFoundError:
+        return
+    
+    # Update or add the LETSENCRYPT_CERT_PATH and LETSENCRYPT_KEY_PATH variables
+    updated = content
+    for name, value in (('LETSENCRYPT_CERT_PATH', cert_path), ('LETSENCRYPT_KEY_PATH', key_path)):
+        line = f'{name}={value}'
+        updated, count = LETSENCRYPT_ENV_RES[name].subn(lambda match: line, updated)
+        if not count:
+            if updated and not updated.endswith('\n'):
+                updated += '\n'
+            updated += line + '\n'
+    
+    # Renewals usually copy to the same paths, so only rewrite the file when something changed
+    if updated == content:
+        print(f"{CYAN}.env file already has the Let's Encrypt certificate paths{RESET}")
+        return
+    
+    # Write updated .env file
+    with open(env_path, 'w') as f:
+        f.write(updated)
+    
+    print(f"{GREEN}Updated .env file with Let's Encrypt certificate paths{RESET}")
         
 def get_letsencrypt_certificate_hybrid(args):
     """Obtain a Let's Encrypt certificate for frontend while using self-signed for internal services"""
     domain = args.domain
     email = args.email
     
-    print(f"\033[36mImplementing hybrid certificate approach for {domain}\033[0m")
-    print(f"\033[36m - Let's Encrypt for frontend/external access\033[0m")
-    print(f"\033[36m - Self-signed for internal service communication\033[0m")
+    print(f"{CYAN}Implementing hybrid certificate approach for {domain}{RESET}")
+    print(f"{CYAN} - Let's Encrypt for frontend/external access{RESET}")
+    print(f"{CYAN} - Self-signed for internal service communication{RESET}")
     
     # First, generate self-signed certificates for all services
     generate_self_signed_certificate(args)
@@ -230,48 +252,70 @@ def get_letsencrypt_certificate_hybrid(args):
     certs_dir = Path("certs")
     
     try:
-        # Check if certbot is installed
-        try:
-            subprocess.run(["certbot", "--version"], check=True, capture_output=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("\033[31mError: certbot is not installed or not in PATH\033[0m")
+        # Check if certbot is installed with a PATH lookup rather than running it
+        certbot_path = shutil.which("certbot")
+        if certbot_path is None:
+            print(f"{RED}Error: certbot is not installed or not in PATH{RESET}")
             return True  # Continue with self-signed certs only
         
         # Run certbot with standalone HTTP challenge
         cmd = [
-            "certbot", "certonly", "--standalone",
+            certbot_path, "certonly", "--standalone",
             "--non-interactive", "--agree-tos",
             f"--email={email}",
             f"--domains={domain}",
+            # Always use the lineage named after the domain: certbot looks it up directly
+            # instead of matching against every lineage, and the files land in
+            # /etc/letsencrypt/live/<domain>/ where copy_letsencrypt_certs_for_nginx reads them
+            f"--cert-name={domain}",
             "--preferred-challenges=http"
         ]
         
-        process = subprocess.run(cmd, capture_output=True, text=True)
+        for attempt in range(CERTBOT_RETRIES + 1):
+            process = subprocess.run(cmd, capture_output=True, text=True)
+            if process.returncode == 0 or attempt == CERTBOT_RETRIES:
+                break
+            
+            # Only rate limits are worth waiting out; other failures won't fix themselves
+            output = process.stdout + process.stderr
+            if not CERTBOT_RATE_LIMIT_RE.search(output):
+                break
+            
+            # When Let's Encrypt says when the limit lifts, retrying any earlier would only
+            # count against it again, so report the time instead of waiting here
+            retry_after = CERTBOT_RETRY_AFTER_RE.search(output)
+            if retry_after:
+                print(f"{YELLOW}Let's Encrypt rate limit reached; retry after {retry_after.group(1)}{RESET}")
+                break
+            
+            wait = min(CERTBOT_RETRY_MAX_WAIT, 30 * 2 ** attempt)
+            print(f"{YELLOW}Let's Encrypt rate limit reached, retrying in {wait} seconds...{RESET}")
+            time.sleep(wait)
         
         if process.returncode != 0:
-            print(f"\033[33mWarning: Could not obtain Let's Encrypt certificate: {process.stderr}\033[0m")
-            print(f"\033[33mUsing self-signed certificates for all services\033[0m")
+            print(f"{YELLOW}Warning: Could not obtain Let's Encrypt certificate: {process.stderr}{RESET}")
+            print(f"{YELLOW}Using self-signed certificates for all services{RESET}")
             return True  # Continue with self-signed certs
         
         # Copy Let's Encrypt certificates for Nginx
         copy_letsencrypt_certs_for_nginx(domain)
         
-        print("\033[32mHybrid certificate setup complete!\033[0m")
-        print("\033[32m - Self-signed certificates for internal services\033[0m")
-        print("\033[32m - Let's Encrypt certificates copied for Nginx proxy\033[0m")
+        print(f"{GREEN}Hybrid certificate setup complete!{RESET}")
+        print(f"{GREEN} - Self-signed certificates for internal services{RESET}")
+        print(f"{GREEN} - Let's Encrypt certificates copied for Nginx proxy{RESET}")
         
         # Set up cron job for certificate renewal - Pass entire args object
         setup_cron_job(domain, args)
         
         return True
     except Exception as e:
-        print(f"\033[31mError in Let's Encrypt certificate setup: {str(e)}\033[0m")
-        print("\033[33mUsing self-signed certificates for all services\033[0m")
+        print(f"{RED}Error in Let's Encrypt certificate setup: {str(e)}{RESET}")
+        print(f"{YELLOW}Using self-signed certificates for all services{RESET}")
         return True  # Continue with self-signed certs
 
 def copy_letsencrypt_certs_for_nginx(domain):
     """Copy Let's Encrypt certificates to the project for Nginx proxy use"""
-    print(f"\033[36mCopying Let's Encrypt certificates for Nginx proxy...\033[0m")
+    print(f"{CYAN}Copying Let's Encrypt certificates for Nginx proxy...{RESET}")
     
     # Create certs directory if it doesn't exist
     certs_dir = Path("certs")
@@ -284,36 +328,33 @@ def copy_letsencrypt_certs_for_nginx(domain):
         nginx_cert = certs_dir / "letsencrypt-fullchain.pem"
         nginx_key = certs_dir / "letsencrypt-privkey.pem"
         
-        # Copy files (might need sudo)
+        # Copy files (might need sudo). Each copy is renamed into place with permissions
+        # 644, so Nginx never reads a partly copied certificate
         try:
-            shutil.copy(letsencrypt_cert, nginx_cert)
-            shutil.copy(letsencrypt_key, nginx_key)
+            copy_file_atomically(letsencrypt_cert, nginx_cert, 0o644)
+            copy_file_atomically(letsencrypt_key, nginx_key, 0o644)
         except PermissionError:
-            print("\033[33mPermission error: trying with sudo...\033[0m")
-            subprocess.run(["sudo", "cp", letsencrypt_cert, nginx_cert], check=True)
-            subprocess.run(["sudo", "cp", letsencrypt_key, nginx_key], check=True)
-            subprocess.run(["sudo", "chown", f"{os.getuid()}:{os.getgid()}", nginx_cert], check=True)
-            subprocess.run(["sudo", "chown", f"{os.getuid()}:{os.getgid()}", nginx_key], check=True)
-        
-        # Set proper permissions
-        os.chmod(nginx_cert, 0o644)
-        os.chmod(nginx_key, 0o644)
+            print(f"{YELLOW}Permission error: trying with sudo...{RESET}")
+            # install copies, chowns and chmods each file in one sudo call
+            owner = ["-o", str(os.getuid()), "-g", str(os.getgid())]
+            subprocess.run(["sudo", "install", "-m", "644", *owner, letsencrypt_cert, str(nginx_cert)], check=True)
+            subprocess.run(["sudo", "install", "-m", "644", *owner, letsencrypt_key, str(nginx_key)], check=True)
         
         # Update the .env file to set the LETSENCRYPT_CERT_PATH and LETSENCRYPT_KEY_PATH variables
         update_env_with_letsencrypt_paths("./certs/letsencrypt-fullchain.pem", "./certs/letsencrypt-privkey.pem")
         
-        print("\033[32mLet's Encrypt certificates copied for Nginx use\033[0m")
+        print(f"{GREEN}Let's Encrypt certificates copied for Nginx use{RESET}")
         return True
     except Exception as e:
-        print(f"\033[31mError copying Let's Encrypt certificates: {str(e)}\033[0m")
+        print(f"{RED}Error copying Let's Encrypt certificates: {str(e)}{RESET}")
         return False
 
 def setup_cron_job(domain, args):
     """Set up a cron job for certificate renewal that preserves all necessary parameters"""
-    print("\033[36mSetting up cron job for certificate renewal...\033[0m")
+    print(f"{CYAN}Setting up cron job for certificate renewal...{RESET}")
     
     if platform.system() == 'Windows':
-        print("\033[33mCron jobs are not supported on Windows. Please set up a scheduled task manually.\033[0m")
+        print(f"{YELLOW}Cron jobs are not supported on Windows. Please set up a scheduled task manually.{RESET}")
         return False
     
     # Get current directory
@@ -321,12 +362,12 @@ def setup_cron_job(domain, args):
     
     # Ensure the renew-cert.py script is executable
     renew_script_path = os.path.join(current_dir, "renew-cert.py")
-    if os.path.exists(renew_script_path):
+    try:
         os.chmod(renew_script_path, 0o755)  # rwxr-xr-x
-        print("\033[32mMade renewal script executable\033[0m")
-    else:
-        print("\033[31mWarning: renew-cert.py not found in current directory\033[0m")
-        print("\033[31mCron job will be created but may not work without the script\033[0m")
+        print(f"{GREEN}Made renewal script executable{RESET}")
+    except FileNotFoundError:
+        print(f"{RED}Warning: renew-cert.py not found in current directory{RESET}")
+        print(f"{RED}Cron job will be created but may not work without the script{RESET}")
     
     # Build cron job command with all necessary parameters
     cron_cmd = f"cd {current_dir} && python3 {current_dir}/renew-cert.py {domain} --no-confirm"
@@ -356,7 +397,7 @@ def setup_cron_job(domain, args):
             existing_cron = f.read()
         
         if cron_cmd in existing_cron:
-            print("\033[33mCron job already exists. Skipping...\033[0m")
+            print(f"{YELLOW}Cron job already exists. Skipping...{RESET}")
         else:
             # Append new cron job
             with open(temp_cron_file, 'a') as f:
@@ -365,8 +406,8 @@ def setup_cron_job(domain, args):
             
             # Install new crontab
             subprocess.run(f"crontab {temp_cron_file}", shell=True, check=True)
-            print("\033[32mCron job added successfully!\033[0m")
-            print(f"\033[32mJob: {cron_job}\033[0m")
+            print(f"{GREEN}Cron job added successfully!{RESET}")
+            print(f"{GREEN}Job: {cron_job}{RESET}")
         
         # Remove temporary file
         os.remove(temp_cron_file)
@@ -381,14 +422,14 @@ def setup_cron_job(domain, args):
             f.write(f"# After renewal, restart Docker services with:\n")
             f.write(f"docker-compose restart\n")
         
-        print(f"\033[32mSaved renewal command to {backup_file}\033[0m")
+        print(f"{GREEN}Saved renewal command to {backup_file}{RESET}")
         
         return True
     except Exception as e:
-        print(f"\033[31mFailed to set up cron job: {str(e)}\033[0m")
-        print("\033[33mYou can manually add this cron job:\033[0m")
-        print(f"\033[33m{cron_job}\033[0m")
-        print("\033[33mRun 'crontab -e' to edit your crontab file.\033[0m")
+        print(f"{RED}Failed to set up cron job: {str(e)}{RESET}")
+        print(f"{YELLOW}You can manually add this cron job:{RESET}")
+        print(f"{YELLOW}{cron_job}{RESET}")
+        print(f"{YELLOW}Run 'crontab -e' to edit your crontab file.{RESET}")
         return False
 
 def setup_nginx_config(args):
@@ -396,10 +437,10 @@ def setup_nginx_config(args):
     nginx_configs_dir = Path("nginx-proxy/configs")
     
     if not nginx_configs_dir.exists():
-        print("\033[33mNginx configs directory not found, skipping Nginx configuration\033[0m")
+        print(f"{YELLOW}Nginx configs directory not found, skipping Nginx configuration{RESET}")
         return False
     
-    print("\033[36mVerifying Nginx configuration...\033[0m")
+    print(f"{CYAN}Verifying Nginx configuration...{RESET}")
     
     # Check if Let's Encrypt certificates exist in certs directory
     letsencrypt_fullchain = Path("certs/letsencrypt-fullchain.pem")
@@ -407,20 +448,22 @@ def setup_nginx_config(args):
     
     # Also make the Nginx start script executable
     nginx_start_script = Path("nginx-proxy/start.sh")
-    if nginx_start_script.exists() and platform.system() != 'Windows':
+    if platform.system() != 'Windows':
         try:
             os.chmod(nginx_start_script, 0o755)
-            print("\033[32mMade Nginx start script executable\033[0m")
+            print(f"{GREEN}Made Nginx start script executable{RESET}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            print(f"\033[33mWarning: Could not make Nginx start script executable: {str(e)}\033[0m")
+            print(f"{YELLOW}Warning: Could not make Nginx start script executable: {str(e)}{RESET}")
     
     has_letsencrypt = letsencrypt_fullchain.exists() and letsencrypt_privkey.exists()
     
     if has_letsencrypt:
-        print("\033[32mLet's Encrypt certificates found for Nginx\033[0m")
-        print("\033[32mNginx will use Let's Encrypt certificates for external connections\033[0m")
+        print(f"{GREEN}Let's Encrypt certificates found for Nginx{RESET}")
+        print(f"{GREEN}Nginx will use Let's Encrypt certificates for external connections{RESET}")
     else:
-        print("\033[33mNo Let's Encrypt certificates found, Nginx will use self-signed certificates\033[0m")
-        print("\033[33mThis will cause browser warnings for external connections\033[0m")
+        print(f"{YELLOW}No Let's Encrypt certificates found, Nginx will use self-signed certificates{RESET}")
+        print(f"{YELLOW}This will cause browser warnings for external connections{RESET}")
     
     return True
\ No newline at end of file
@@ -4,6 +4,7 @@ import os
 import datetime
 from pathlib import Path
 from .utils.file_operations import write_file, append_to_gitignore, ensure_directory
+from .utils.colors import GREEN, RESET
 
 def create_environment_config(args, credentials):
     """Generate all configuration files needed for the environment."""
@@ -81,7 +82,7 @@ LETSENCRYPT_KEY_PATH=./certs/server.key
 
     # Write to .env file
     write_file('.env', env_content)
-    print("\033[32mGenerated new core .env file with minimal variables\033[0m")
+    print(f"{GREEN}Generated new core .env file with minimal variables{RESET}")
 
 def create_backend_env(args, creds):
     """Generate the backend-specific .env file."""
@@ -135,7 +136,7 @@ GOOGLE_CALLBACK_URL={args.google_callback_url}
 
     # Write to backend/.env file
     write_file('backend/.env', env_content)
-    print("\033[32mGenerated backend/.env file with backend-specific variables\033[0m")
+    print(f"{GREEN}Generated backend/.env file with backend-specific variables{RESET}")
 
 def create_redis_env(creds):
     """Generate the Redis-specific .env file."""
@@ -152,7 +153,7 @@ REDIS_ENCRYPTION_KEY={creds['redis_encryption_key']}
 
     # Write to redis/.env file
     write_file('redis/.env', env_content)
-    print("\033[32mGenerated redis/.env file with Redis-specific variables\033[0m")
+    print(f"{GREEN}Generated redis/.env file with Redis-specific variables{RESET}")
 
 def create_db_env(creds):
     """Generate the database-specific .env file."""
@@ -171,7 +172,7 @@ POSTGRES_SSL=true
 
     # Write to db/.env file
     write_file('db/.env', env_content)
-    print("\033[32mGenerated db/.env file with database-specific variables\033[0m")
+    print(f"{GREEN}Generated db/.env file with database-specific variables{RESET}")
 
 def create_relation_service_env(args, creds):
     """Generate the relation-service-specific .env file."""
@@ -199,7 +200,7 @@ POSTGRES_SSL=true
 
     # Write to relation-service/.env file
     write_file('relation-service/.env', env_content)
-    print("\033[32mGenerated relation-service/.env file with service-specific variables\033[0m")
+    print(f"{GREEN}Generated relation-service/.env file with service-specific variables{RESET}")
 
 def create_frontend_env(args):
     """Create frontend .env file for HTTPS."""
@@ -217,7 +218,7 @@ REACT_APP_API_URL=https://{args.hostname}:3001"""
 
     # Write to frontend .env file
     write_file(frontend_env_path, frontend_env_content)
-    print("\033[32mCreated frontend/.env file for HTTPS\033[0m")
+    print(f"{GREEN}Created frontend/.env file for HTTPS{RESET}")
 
 def update_gitignore():
     """Add sensitive files to .gitignore."""
@@ -237,4 +238,4 @@ def update_gitignore():
     result = append_to_gitignore(gitignore_entries)
     
     if result:
-        print("\033[32mUpdated .gitignore with necessary entries\033[0m")
\ No newline at end of file
+        print(f"{GREEN}Updated .gitignore with necessary entries{RESET}")
\ No newline at end of file
@@ -6,6 +6,7 @@ import os
 import time
 import datetime
 from .utils.file_operations import write_file
+from .utils.colors import RED, GREEN, YELLOW, RESET
 
 def generate_secure_key(bytes_length):
     """Generate a secure random key as a hex string."""
@@ -42,7 +43,7 @@ def generate_security_credentials(args):
         credentials['backup_file'] = backup_filename
     else:
         credentials['is_new'] = False
-        print("\033[33mService .env files already exist, skipping credential generation\033[0m")
+        print(f"{YELLOW}Service .env files already exist, skipping credential generation{RESET}")
         
         # Add Google SSO to existing .env if needed
         if args.google_client_id and args.google_client_secret:
@@ -84,32 +85,34 @@ Google Callback URL: {args.google_callback_url}"""
 
 def update_env_with_google_sso(args):
     """Update existing .env files with Google SSO configuration."""
-    print("\033[33mUpdating existing backend/.env file with Google SSO configuration...\033[0m")
+    print(f"{YELLOW}Updating existing backend/.env file with Google SSO configuration...{RESET}")
     
     # Only the backend needs Google SSO configuration
     backend_env_path = 'backend/.env'
     
-    if os.path.exists(backend_env_path):
-        # Read existing .env
+    # Read existing .env
+    try:
         with open(backend_env_path, 'r') as f:
             env_content = f.read()
-        
+    except FileNotFoundError:
+        env_content = None
+    
+    if env_content is not None:
         # Check if Google SSO is already configured
         if 'GOOGLE_CLIENT_ID' in env_content:
-            print("\033[33mGoogle SSO configuration already exists in backend/.env. Updating values...\033[0m")
+            print(f"{YELLOW}Google SSO configuration already exists in backend/.env. Updating values...{RESET}")
             
-            # Read existing .env line by line
+            # Go over the content already read instead of opening the file again
             lines = []
-            with open(backend_env_path, 'r') as f:
-                for line in f:
-                    if line.startswith('GOOGLE_CLIENT_ID='):
-                        lines.append(f"GOOGLE_CLIENT_ID={args.google_client_id}\n")
-                    elif line.startswith('GOOGLE_CLIENT_SECRET='):
-                        lines.append(f"GOOGLE_CLIENT_SECRET={args.google_client_secret}\n")
-                    elif line.startswith('GOOGLE_CALLBACK_URL='):
-                        lines.append(f"GOOGLE_CALLBACK_URL={args.google_callback_url}\n")
-                    else:
-                        lines.append(line)
+            for line in env_content.splitlines(keepends=True):
+                if line.startswith('GOOGLE_CLIENT_ID='):
+                    lines.append(f"GOOGLE_CLIENT_ID={args.google_client_id}\n")
+                elif line.startswith('GOOGLE_CLIENT_SECRET='):
+                    lines.append(f"GOOGLE_CLIENT_SECRET={args.google_client_secret}\n")
+                elif line.startswith('GOOGLE_CALLBACK_URL='):
+                    lines.append(f"GOOGLE_CALLBACK_URL={args.google_callback_url}\n")
+                else:
+                    lines.append(line)
             
             # Write updated .env
             with open(backend_env_path, 'w') as f:
@@ -124,6 +127,6 @@ GOOGLE_CLIENT_SECRET={args.google_client_secret}
 GOOGLE_CALLBACK_URL={args.google_callback_url}
 """)
         
-        print("\033[32mUpdated backend/.env with Google SSO configuration\033[0m")
+        print(f"{GREEN}Updated backend/.env with Google SSO configuration{RESET}")
     else:
-        print("\033[31mNo existing backend/.env file found for Google SSO configuration\033[0m")
\ No newline at end of file
+        print(f"{RED}No existing backend/.env file found for Google SSO configuration{RESET}")
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""Terminal color codes for console output."""
+
+import sys
+
+# Left empty when output is redirected to a file or log, so no escape codes end up there
+if sys.stdout.isatty():
+    RED, GREEN, YELLOW, CYAN, RESET = "\033[31m", "\033[32m", "\033[33m", "\033[36m", "\033[0m"
+else:
+    RED = GREEN = YELLOW = CYAN = RESET = ""
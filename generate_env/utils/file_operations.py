@@ -1,16 +1,62 @@
 """Utility functions for file operations."""
 
 import os
+import stat
+import shutil
 from pathlib import Path
+from .colors import RED, GREEN, CYAN, RESET
 
 def ensure_directory(directory_path):
     """Create a directory if it doesn't exist."""
     directory = Path(directory_path)
     if not directory.exists():
         directory.mkdir(parents=True)
-        print(f"\033[36mCreated directory: {directory}\033[0m")
+        print(f"{CYAN}Created directory: {directory}{RESET}")
     return directory
 
+def temporary_path_for(target_path):
+    """Return a free temp path next to target_path, to be renamed over it once complete."""
+    directory, name = os.path.split(os.fspath(target_path))
+    temp_path = os.path.join(directory, f".{name}.tmp")
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+    return temp_path
+
+def discard_temporary(temp_path):
+    """Remove a temp file that was never finished."""
+    try:
+        os.unlink(temp_path)
+    except OSError:
+        pass
+
+def link_or_copy(source_path, target_path):
+    """Hard link target_path to source_path, copying instead where links aren't supported."""
+    # The link is made under a temp name and renamed into place, so readers always see
+    # either the old file or the new one; any older link keeps its own contents
+    temp_path = temporary_path_for(target_path)
+    try:
+        try:
+            os.link(source_path, temp_path)
+        except OSError:
+            shutil.copy(source_path, temp_path)
+    except BaseException:
+        discard_temporary(temp_path)
+        raise
+    os.replace(temp_path, target_path)
+
+def copy_file_atomically(source_path, target_path, mode):
+    """Copy a file over target_path with the given permissions, replacing it in one rename."""
+    temp_path = temporary_path_for(target_path)
+    try:
+        shutil.copyfile(source_path, temp_path)
+        os.chmod(temp_path, mode)
+    except BaseException:
+        discard_temporary(temp_path)
+        raise
+    os.replace(temp_path, target_path)
+
 def write_file(file_path, content):
     """Write content to a file."""
     try:
@@ -18,9 +64,34 @@ def write_file(file_path, content):
             file.write(content)
         return True
     except Exception as e:
-        print(f"\033[31mError writing to file {file_path}: {str(e)}\033[0m")
+        print(f"{RED}Error writing to file {file_path}: {str(e)}{RESET}")
         return False
 
+def write_bytes_with_mode(file_path, data, mode):
+    """Write bytes to a file through a single descriptor and set its permissions.
+    
+    The data goes to a temp file that is renamed over file_path, so services reading
+    the file never see it half written.
+    """
+    temp_path = temporary_path_for(file_path)
+    try:
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), mode)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            # The creation mode is masked by the umask
+            if os.name == 'posix':
+                os.fchmod(fd, mode)
+        finally:
+            os.close(fd)
+        if os.name != 'posix':
+            os.chmod(temp_path, mode)
+    except BaseException:
+        discard_temporary(temp_path)
+        raise
+    os.replace(temp_path, file_path)
+
 def read_file(file_path):
     """Read content from a file."""
     try:
@@ -29,33 +100,33 @@ def read_file(file_path):
     except FileNotFoundError:
         return None
     except Exception as e:
-        print(f"\033[31mError reading file {file_path}: {str(e)}\033[0m")
+        print(f"{RED}Error reading file {file_path}: {str(e)}{RESET}")
         return None
 
 def append_to_gitignore(entries):
     """Add entries to .gitignore file."""
     gitignore_path = '.gitignore'
     
-    if os.path.exists(gitignore_path):
+    try:
         with open(gitignore_path, 'r') as f:
             current_gitignore = f.read().splitlines()
-        
+    except FileNotFoundError:
+        with open(gitignore_path, 'w') as f:
+            f.write('\n'.join(entries) + '\n')
+        print(f"{GREEN}Created .gitignore with necessary entries{RESET}")
+        return True
+    else:
         # Find which entries need to be added
         new_entries = [entry for entry in entries if entry not in current_gitignore]
         
         if new_entries:
             with open(gitignore_path, 'a') as f:
                 f.write('\n' + '\n'.join(new_entries) + '\n')
-            print("\033[32mUpdated .gitignore with new entries\033[0m")
+            print(f"{GREEN}Updated .gitignore with new entries{RESET}")
             return True
         else:
-            print("\033[36mNo new entries needed for .gitignore\033[0m")
+            print(f"{CYAN}No new entries needed for .gitignore{RESET}")
             return False
-    else:
-        with open(gitignore_path, 'w') as f:
-            f.write('\n'.join(entries) + '\n')
-        print("\033[32mCreated .gitignore with necessary entries\033[0m")
-        return True
 
 def make_executable(file_path):
     """Make a file executable."""
@@ -65,6 +136,22 @@ def make_executable(file_path):
             os.chmod(file_path, current_permissions | 0o111)  # Add executable bit
             return True
         except Exception as e:
-            print(f"\033[31mError making file executable: {str(e)}\033[0m")
+            print(f"{RED}Error making file executable: {str(e)}{RESET}")
             return False
-    return False  # Windows or other OS
\ No newline at end of file
+    return False  # Windows or other OS
+
+def make_readable(directory_path):
+    """Make a directory tree readable by all, like chmod -R a+r but without spawning chmod."""
+    if os.name != 'posix':
+        return False
+    try:
+        for root, dirs, files in os.walk(directory_path):
+            for path in [root] + [os.path.join(root, name) for name in files]:
+                mode = os.lstat(path).st_mode
+                # Skip files that are already readable (e.g. the 644 PEM files) and symlinks
+                if not stat.S_ISLNK(mode) and mode & 0o444 != 0o444:
+                    os.chmod(path, stat.S_IMODE(mode) | 0o444)
+        return True
+    except Exception as e:
+        print(f"{RED}Error making {directory_path} readable: {str(e)}{RESET}")
+        return False
\ No newline at end of file
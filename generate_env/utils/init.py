@@ -1,4 +1,4 @@
 """Utility functions for the generate_env package."""
 
 # Import utility functions to expose from the utils package
-from .file_operations import ensure_directory, write_file, read_file, append_to_gitignore, make_executable
\ No newline at end of file
+from .file_operations import ensure_directory, link_or_copy, copy_file_atomically, write_file, write_bytes_with_mode, read_file, append_to_gitignore, make_executable, make_readable
\ No newline at end of file
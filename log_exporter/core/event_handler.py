@@ -51,6 +51,8 @@ class LogEventHandler(FileSystemEventHandler):
                 # Check if this is a new date directory created by the C2 framework
                 if self.forwarder.parser.is_date_directory(event.src_path):
                     self.logger.info(f"New date directory detected: {event.src_path}")
+                    # The parser's cached directory list is now stale
+                    self.forwarder.parser.invalidate_log_dirs_cache()
                     # Add a new observer for this directory
                     self.forwarder.setup_observer(event.src_path)
                 return
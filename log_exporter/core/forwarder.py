@@ -5,18 +5,67 @@ import pickle
 import logging
 import requests
 import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timedelta
 from watchdog.observers import Observer
 
 from core.event_handler import LogEventHandler
-from core.utils import rotate_logs, cleanup_stale_locks, create_lock_file, remove_lock_file
-from core.rate_limit_queue import RateLimitQueue
+from core.utils import (rotate_logs, get_registered_log_files, cleanup_stale_locks, create_lock_file,
+                        remove_lock_file, line_count_to_offset, encode_json)
+from core.rate_limit_queue import RateLimitQueue, TokenBucket
+
+# Parser used by parse worker processes, set once per process by init_parse_worker
+worker_parser = None
+
+def init_parse_worker(parser):
+    """Keep a copy of the parser in a parse worker process"""
+    global worker_parser
+    worker_parser = parser
+
+def parse_with_snapshot(parser, abs_log_file, position):
+    """
+    Parse one log file against a private copy of its processed position
+    
+    Args:
+        parser: Parser to run
+        abs_log_file: Absolute path to the log file
+        position: Previously processed position for this file, or None
+        
+    Returns:
+        tuple: (absolute path, new position or None, list of entries)
+    """
+    snapshot = {} if position is None else {abs_log_file: position}
+    entries = parser.parse_log_file(abs_log_file, snapshot)
+    return abs_log_file, snapshot.get(abs_log_file), entries
+
+def parse_in_worker(abs_log_file, position, shared_state=None):
+    """
+    Parse one log file in a parse worker process
+    
+    Args:
+        abs_log_file: Absolute path to the log file
+        position: Previously processed position for this file, or None
+        shared_state: The main parser's get_shared_state() value, or None
+        
+    Returns:
+        tuple: (absolute path, new position or None, list of entries, shared state changes made by this job)
+    """
+    try:
+        if shared_state is not None:
+            worker_parser.merge_shared_state(shared_state)
+        previous_state = worker_parser.get_shared_state()
+        result = parse_with_snapshot(worker_parser, abs_log_file, position)
+        return result + (worker_parser.get_shared_state_changes(previous_state),)
+    except Exception as e:
+        logging.getLogger("LogForwarder").error("Error parsing %s: %s", abs_log_file, e, exc_info=True)
+        return abs_log_file, None, [], None
 
 class LogForwarder:
     """Main log forwarding engine that handles watching and sending logs to Clio"""
     
     def __init__(self, parser, api_key, clio_url, data_dir, poll_interval=5, verify_ssl=True, 
-                 rate_limit=120, rate_window=60, max_queue_size=10000):
+                 rate_limit=120, rate_window=60, max_queue_size=10000, parse_workers=None,
+                 parse_processes=0):
         self.parser = parser
         self.api_key = api_key
         self.clio_url = clio_url.rstrip("/")
@@ -42,6 +91,26 @@ class LogForwarder:
             max_queue_size=max_queue_size
         )
         
+        # Token bucket that paces requests to the configured rate limit
+        self.token_bucket = TokenBucket(rate_limit=rate_limit, rate_window=rate_window)
+        
+        # Worker pool for parsing several changed log files at once. Parsing is
+        # CPU-bound, so parsers that can share their cross-file state can use processes.
+        if parse_processes and not parser.supports_process_pool:
+            self.logger.warning(f"{parser.__class__.__name__} keeps state between files, parsing with threads instead of processes")
+            parse_processes = 0
+        self.parse_in_processes = bool(parse_processes)
+        if parse_processes:
+            parse_workers = parse_processes
+            self.parse_executor = ProcessPoolExecutor(max_workers=parse_workers,
+                                                      initializer=init_parse_worker, initargs=(parser,))
+            self.parse_job = parse_in_worker
+        else:
+            if parse_workers is None:
+                parse_workers = min(8, os.cpu_count() or 1)
+            self.parse_executor = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="parser")
+            self.parse_job = self.parse_one
+        
         # Clio API endpoint for log ingestion
         self.ingest_url = f"{self.clio_url}/ingest/logs"
         
@@ -63,6 +132,7 @@ class LogForwarder:
         self.logger.info(f"- SSL verification: {'Disabled' if not verify_ssl else 'Enabled'}")
         self.logger.info(f"- Rate limit: {rate_limit} requests per {rate_window} seconds")
         self.logger.info(f"- Max queue size: {max_queue_size} entries")
+        self.logger.info(f"- Parse workers: {parse_workers} {'processes' if parse_processes else 'threads'}")
     
     def load_state(self):
         """Load the previous processing state from disk"""
@@ -79,6 +149,10 @@ class LogForwarder:
                         abs_path = os.path.abspath(file_path)
                         self.processed_lines[abs_path] = lines
                     
+                    # Older state files stored line counts; convert them for parsers that track byte offsets
+                    if self.parser.tracks_byte_offsets and not state.get('byte_offsets'):
+                        self.migrate_line_counts()
+                    
                     # Load file metadata if present
                     self.file_metadata = state.get('file_metadata', {})
                         
@@ -93,6 +167,18 @@ class LogForwarder:
             self.processed_lines = {}
             self.file_metadata = {}
     
+    def migrate_line_counts(self):
+        """Convert processed line counts from an older state file into byte offsets"""
+        migrated = 0
+        for file_path, lines in list(self.processed_lines.items()):
+            try:
+                self.processed_lines[file_path] = line_count_to_offset(file_path, lines)
+                migrated += 1
+            except OSError:
+                # The file is gone, so there's nothing left to resume
+                del self.processed_lines[file_path]
+        self.logger.info(f"Converted {migrated} tracked files from line counts to byte offsets")
+    
     def save_state(self):
         """Save the current processing state to disk"""
         try:
@@ -118,6 +204,7 @@ class LogForwarder:
                 pickle.dump({
                     'processed_lines': processed_lines_with_abs_path,
                     'file_metadata': self.file_metadata,
+                    'byte_offsets': self.parser.tracks_byte_offsets,
                     'last_run': datetime.now().isoformat()
                 }, f)
             self.logger.debug(f"State saved to {self.state_file}")
@@ -125,18 +212,20 @@ class LogForwarder:
             self.logger.error(f"Failed to save state: {str(e)}")
     
     def prune_old_state_entries(self):
-        """Remove entries for files older than max_tracked_days from the state"""
+        """Remove entries for files older than max_tracked_days, or no longer on disk, from the state"""
         try:
             # Get cutoff date from the parser
             cutoff_str = self.parser.get_cutoff_date_str()
             
-            # Find files to prune based on path pattern (looking for date directories)
+            # Find files to prune based on path pattern (looking for date directories).
+            # Files that were deleted or rotated away are dropped too, otherwise logs
+            # outside date directories would keep their entries forever.
             files_to_prune = []
             
             # Find paths to prune in processed_lines and file_metadata
             for mapping in [self.processed_lines, self.file_metadata]:
                 for file_path in list(mapping.keys()):
-                    if self.parser.is_file_outdated(file_path, cutoff_str):
+                    if self.parser.is_file_outdated(file_path, cutoff_str) or not os.path.exists(file_path):
                         if file_path not in files_to_prune:  # Avoid duplicates
                             files_to_prune.append(file_path)
             
@@ -151,7 +240,7 @@ class LogForwarder:
                     del self.file_metadata[file_path]
             
             if pruned_count > 0:
-                self.logger.info(f"Pruned {pruned_count} entries for files older than {cutoff_str}")
+                self.logger.info(f"Pruned {pruned_count} entries for files older than {cutoff_str} or no longer on disk")
                 # Save the updated state to disk
                 self.save_state()
                 
@@ -176,22 +265,8 @@ class LogForwarder:
                 # Rate limited
                 self.logger.warning(f"⚠️ Connected to Clio API but received rate limit response")
                 
-                # Try to get reset information from response headers
-                reset_seconds = None
-                retry_after = resp.headers.get('Retry-After')
-                if retry_after:
-                    if retry_after.isdigit():
-                        reset_seconds = int(retry_after)
-                    else:
-                        try:
-                            # Try to parse as HTTP date
-                            reset_time = datetime.strptime(retry_after, "%a, %d %b %Y %H:%M:%S %Z")
-                            reset_seconds = (reset_time - datetime.now()).total_seconds()
-                        except ValueError:
-                            pass
-                
-                # Set rate limit in queue
-                self.rate_queue.set_rate_limited(reset_seconds)
+                # Set rate limit in queue using the reset information from response headers
+                self.rate_queue.set_rate_limited(self.get_retry_after_seconds(resp))
                 
                 return True  # Connection is valid, just rate limited
             else:
@@ -218,8 +293,8 @@ class LogForwarder:
                 self.logger.debug(f"Rate limited, waiting {wait_seconds:.1f} seconds before processing queue")
                 return
                 
-            # Try to send up to 10 logs at a time
-            logs_to_send = self.rate_queue.get_queued_entries(max_count=10)
+            # Try to send up to one batch (a single request) at a time
+            logs_to_send = self.rate_queue.get_queued_entries(max_count=25)
             if not logs_to_send:
                 return
                 
@@ -230,14 +305,14 @@ class LogForwarder:
             self.logger.error(traceback.format_exc())
     
     def send_logs_to_clio(self, logs):
-        """Send logs to the Clio API"""
+        """Send logs to the Clio API, several entries per request"""
         if not logs:
             return True
         
         try:
             # Debug: Print what we're about to send
             self.logger.debug(f"Preparing to send {len(logs)} logs to Clio")
-            if logs:
+            if logs and self.logger.isEnabledFor(logging.DEBUG):
                 # Log the first entry with special attention to the timestamp
                 first_log = logs[0]
                 self.logger.debug(f"First log entry with timestamp {first_log.get('timestamp', 'No timestamp')}: {json.dumps(first_log, indent=2)}")
@@ -255,73 +330,53 @@ class LogForwarder:
             for i in range(0, len(logs), batch_size):
                 batch = logs[i:i+batch_size]
                 
+                # Ensure each log entry has a timestamp
+                for log_entry in batch:
+                    if 'timestamp' not in log_entry or not log_entry['timestamp']:
+                        log_entry['timestamp'] = datetime.now().isoformat()
+                        self.logger.warning(f"Missing timestamp, using current time: {log_entry['timestamp']}")
+                
                 max_retries = 3
                 retry_delay = 5  # seconds
                 
                 for attempt in range(max_retries):
                     try:
-                        # IMPORTANT: Try sending one log at a time instead of a batch
-                        # This helps debug which specific log might be causing issues
-                        for log_entry in batch:
-                            # Ensure each log entry has a timestamp
-                            if 'timestamp' not in log_entry or not log_entry['timestamp']:
-                                log_entry['timestamp'] = datetime.now().isoformat()
-                                self.logger.warning(f"Missing timestamp, using current time: {log_entry['timestamp']}")
-                            
-                            self.logger.debug(f"Sending JSON payload with timestamp {log_entry.get('timestamp')}: {json.dumps(log_entry)}")
-
-                            time.sleep(0.05)
-                            
-                            resp = requests.post(
-                                self.ingest_url,
-                                headers={
-                                    "X-API-Key": self.api_key,
-                                    "Content-Type": "application/json"
-                                },
-                                json=log_entry,
-                                verify=self.verify_ssl,
-                                timeout=30
-                            )
-                            
-                            # Log the full response for debugging
-                            self.logger.debug(f"Response status: {resp.status_code}")
-                            self.logger.debug(f"Response body: {resp.text}")
-                            
-                            if resp.status_code in (200, 201, 207):
-                                result = resp.json()
-                                self.logger.info(f"✅ Sent log entry to Clio: {result.get('message', 'Success')}")
-                                
-                                # Track the request for rate limiting
-                                self.rate_queue.track_request()
-                            elif resp.status_code == 429:
-                                # Rate limited - add to queue and stop processing
-                                self.logger.warning(f"⚠️ Rate limited by Clio API")
-                                
-                                # Try to get reset information from response headers
-                                reset_seconds = None
-                                retry_after = resp.headers.get('Retry-After')
-                                if retry_after:
-                                    if retry_after.isdigit():
-                                        reset_seconds = int(retry_after)
-                                    else:
-                                        try:
-                                            # Try to parse as HTTP date
-                                            reset_time = datetime.strptime(retry_after, "%a, %d %b %Y %H:%M:%S %Z")
-                                            reset_seconds = (reset_time - datetime.now()).total_seconds()
-                                        except ValueError:
-                                            pass
-                                
-                                # Set rate limit in queue
-                                self.rate_queue.set_rate_limited(reset_seconds)
-                                
-                                # Add remaining logs to queue
-                                remaining_logs = batch[batch.index(log_entry):]
-                                self.rate_queue.add_batch(remaining_logs)
-                                return False
-                            else:
-                                self.logger.error(f"❌ Failed to send log entry (attempt {attempt+1}/{max_retries}): {resp.status_code}")
-                                self.logger.error(f"Failed entry: {json.dumps(log_entry)}")
-                                self.logger.error(resp.text)
+                        # The whole batch goes out as one JSON array in one request
+                        resp = self.post_to_clio(batch)
+                        
+                        if resp.status_code in (200, 201, 207):
+                            result = resp.json()
+                            self.logger.info(f"✅ Sent {len(batch)} log entries to Clio: {result.get('message', 'Success')}")
+                        elif resp.status_code == 429:
+                            # Rate limited - queue this batch and everything after it and stop processing
+                            self.logger.warning(f"⚠️ Rate limited by Clio API")
+                            self.rate_queue.set_rate_limited(self.get_retry_after_seconds(resp))
+                            self.rate_queue.add_batch(logs[i:])
+                            return False
+                        elif resp.status_code in (400, 413) and len(batch) > 1:
+                            # Server refused the batch as a whole, fall back to one entry per request
+                            self.logger.warning(f"Batch rejected ({resp.status_code}), sending {len(batch)} entries individually")
+                            for j, log_entry in enumerate(batch):
+                                try:
+                                    entry_resp = self.post_to_clio(log_entry)
+                                except requests.exceptions.RequestException as e:
+                                    # Entries before this one were already accepted, so queue only
+                                    # the rest instead of letting the batch retry send them again
+                                    self.logger.error(f"❌ Network error sending log entry: {str(e)}")
+                                    self.rate_queue.add_batch(batch[j:] + logs[i+batch_size:])
+                                    return False
+                                if entry_resp.status_code == 429:
+                                    self.logger.warning(f"⚠️ Rate limited by Clio API")
+                                    self.rate_queue.set_rate_limited(self.get_retry_after_seconds(entry_resp))
+                                    self.rate_queue.add_batch(batch[j:] + logs[i+batch_size:])
+                                    return False
+                                if entry_resp.status_code not in (200, 201, 207):
+                                    self.logger.error(f"❌ Failed to send log entry: {entry_resp.status_code}")
+                                    self.logger.error(f"Failed entry: {json.dumps(log_entry)}")
+                                    self.logger.error(entry_resp.text)
+                        else:
+                            self.logger.error(f"❌ Failed to send {len(batch)} log entries (attempt {attempt+1}/{max_retries}): {resp.status_code}")
+                            self.logger.error(resp.text)
                         
                         # Break the retry loop if we got here
                         break
@@ -333,7 +388,7 @@ class LogForwarder:
                         else:
                             self.logger.error("Max retries reached, giving up on this batch")
                             # Queue the remaining logs for later
-                            self.rate_queue.add_batch(batch)
+                            self.rate_queue.add_batch(logs[i:])
                             return False
                 
             return True
@@ -345,24 +400,87 @@ class LogForwarder:
             # Queue the logs for retry
             self.rate_queue.add_batch(logs)
             return False
+    
+    def post_to_clio(self, payload):
+        """
+        POST a single entry or a list of entries to the ingest endpoint
+        
+        Args:
+            payload: A log entry dict or a list of them
+            
+        Returns:
+            requests.Response: The API response
+        """
+        # Pace requests so we stay under the API rate limit instead of waiting for a 429
+        self.token_bucket.acquire()
+        
+        body = encode_json(payload)
+        self.logger.debug(f"Sending JSON payload: {body[:500]!r}")
+        
+        resp = requests.post(
+            self.ingest_url,
+            headers={
+                "X-API-Key": self.api_key,
+                "Content-Type": "application/json"
+            },
+            data=body,
+            verify=self.verify_ssl,
+            timeout=30
+        )
+        
+        # Log the full response for debugging
+        self.logger.debug(f"Response status: {resp.status_code}")
+        self.logger.debug(f"Response body: {resp.text}")
+        
+        # Track the request for rate limiting
+        if resp.status_code in (200, 201, 207):
+            self.rate_queue.track_request()
+        
+        return resp
+    
+    def get_retry_after_seconds(self, resp):
+        """Get the seconds until a rate limit resets from a 429 response, or None if not given"""
+        retry_after = resp.headers.get('Retry-After')
+        if not retry_after:
+            return None
+        if retry_after.isdigit():
+            return int(retry_after)
+        try:
+            # Try to parse as HTTP date
+            reset_time = datetime.strptime(retry_after, "%a, %d %b %Y %H:%M:%S %Z")
+            return (reset_time - datetime.now()).total_seconds()
+        except ValueError:
+            return None
 
     def process_log_file(self, log_file):
         """Process a single log file"""
+        self.process_log_files([log_file])
+    
+    def claim_log_file(self, log_file):
+        """
+        Check that a log file should be processed and lock it
+        
+        Args:
+            log_file: Path to the log file
+            
+        Returns:
+            tuple: (absolute path, lock path), or None if the file should be skipped
+        """
         # Convert to absolute path
         abs_log_file = os.path.abspath(log_file)
         
         if not os.path.exists(abs_log_file):
-            return
+            return None
         
         # Skip if the file is not a valid log file for this parser
         if not self.parser.is_valid_log_file(abs_log_file):
-            return
+            return None
         
         # Skip if the file is too old
         cutoff_str = self.parser.get_cutoff_date_str()
         if self.parser.is_file_outdated(abs_log_file, cutoff_str):
             self.logger.debug(f"Skipping file in outdated directory: {abs_log_file}")
-            return
+            return None
         
         # Use a lock to ensure only one thread processes this file at a time
         file_name = os.path.basename(abs_log_file)
@@ -371,13 +489,80 @@ class LogForwarder:
         # Skip if file is already being processed
         if os.path.exists(lock_path):
             self.logger.debug(f"File {abs_log_file} is already being processed, skipping")
-            return
+            return None
             
         # Create the lock file
         create_lock_file(lock_path)
+        return abs_log_file, lock_path
+    
+    def parse_one(self, abs_log_file, position, shared_state=None):
+        """
+        Parse one log file against a private copy of its processed position
         
+        Runs on the parse thread pool, so it only touches its own snapshot of
+        processed_lines; the caller merges the new position back in. Threads
+        already share the parser, so shared_state is not used.
+        
+        Args:
+            abs_log_file: Absolute path to the log file
+            position: Previously processed position for this file, or None
+            shared_state: Unused, accepted to match parse_in_worker
+            
+        Returns:
+            tuple: (absolute path, new position or None, list of entries, None)
+        """
+        try:
+            return parse_with_snapshot(self.parser, abs_log_file, position) + (None,)
+        except Exception as e:
+            self.logger.error("Error parsing %s: %s", abs_log_file, e, exc_info=True)
+            return abs_log_file, None, [], None
+    
+    def process_log_files(self, log_files):
+        """
+        Parse a group of log files on the worker pool and send their entries
+        
+        Each file is handed to the pool as soon as it is claimed, so when
+        log_files is a generator that is still walking directories, parsing
+        of the first files overlaps with finding the rest.
+        
+        Args:
+            log_files: Iterable of log file paths
+            
+        Returns:
+            int: Number of files that were parsed
+        """
+        claimed = []
+        futures = []
+        
+        # Worker processes start each batch from the parser's current cross-file state
+        shared_state = self.parser.get_shared_state() if self.parse_in_processes else None
+        try:
+            for log_file in log_files:
+                claim = self.claim_log_file(log_file)
+                if claim:
+                    claimed.append(claim)
+                    abs_log_file = claim[0]
+                    futures.append(self.parse_executor.submit(
+                        self.parse_job, abs_log_file, self.processed_lines.get(abs_log_file), shared_state))
+            
+            # Merge positions and state and send entries back on this thread, in claim order
+            for future in futures:
+                abs_log_file, position, entries, worker_state = future.result()
+                if position is not None:
+                    self.processed_lines[abs_log_file] = position
+                if worker_state is not None:
+                    self.parser.merge_shared_state(worker_state)
+                self.handle_entries(abs_log_file, entries)
+        finally:
+            # Always remove the lock files when done
+            for _, lock_path in claimed:
+                remove_lock_file(lock_path)
+        
+        return len(claimed)
+    
+    def handle_entries(self, abs_log_file, entries):
+        """Send or queue the entries parsed from a log file and record its metadata"""
         try:
-            entries = self.parser.parse_log_file(abs_log_file, self.processed_lines)
             if entries:
                 # Check if we're rate limited first
                 rate_limited, wait_seconds = self.rate_queue.is_rate_limited()
@@ -409,32 +594,29 @@ class LogForwarder:
         except Exception as e:
             self.logger.error(f"Error processing {abs_log_file}: {str(e)}")
             self.logger.error(traceback.format_exc())
-        finally:
-            # Always remove the lock file when done
-            remove_lock_file(lock_path)
     
-    def scan_directories(self):
-        """Scan all relevant log directories for log files"""
-        try:
-            log_dirs = self.parser.get_log_directories()
-            files_processed = 0
+    def find_changed_files(self, log_dirs, cutoff_str):
+        """
+        Yield the log files that are new or have changed since they were last processed
+        
+        Args:
+            log_dirs: Directories to look in
+            cutoff_str: Cutoff date string in ISO format (YYYY-MM-DD)
             
-            for log_dir in log_dirs:
-                if not os.path.exists(log_dir):
-                    continue
-                    
-                for file_name in os.listdir(log_dir):
-                    log_file = os.path.join(log_dir, file_name)
-                    abs_log_file = os.path.abspath(log_file)
-                    
-                    # Skip if not a valid log file
-                    if not self.parser.is_valid_log_file(abs_log_file):
-                        continue
+        Yields:
+            str: Absolute path of each changed log file
+        """
+        for log_dir in log_dirs:
+            # A directory that has disappeared fails the scandir itself, no need to stat it first
+            try:
+                for entry in self.parser.iter_log_files(log_dir, cutoff_str):
+                    abs_log_file = os.path.abspath(entry.path)
                     
                     # Check if the file has been modified since we last processed it
                     try:
-                        current_size = os.path.getsize(abs_log_file)
-                        last_modified = os.path.getmtime(abs_log_file)
+                        st = entry.stat()
+                        current_size = st.st_size
+                        last_modified = st.st_mtime
                         
                         if abs_log_file in self.file_metadata:
                             old_size = self.file_metadata[abs_log_file].get('size', 0)
@@ -443,15 +625,24 @@ class LogForwarder:
                             # Only process if file has changed
                             if current_size > old_size or last_modified > old_mtime:
                                 self.logger.debug(f"File has changed: {abs_log_file}")
-                                self.process_log_file(log_file)
-                                files_processed += 1
+                                yield abs_log_file
                         else:
                             # First time seeing this file
                             self.logger.debug(f"Processing new file: {abs_log_file}")
-                            self.process_log_file(log_file)
-                            files_processed += 1
+                            yield abs_log_file
                     except Exception as e:
                         self.logger.error(f"Error checking file status: {abs_log_file}, {str(e)}")
+            except FileNotFoundError:
+                continue
+    
+    def scan_directories(self):
+        """Scan all relevant log directories for log files"""
+        try:
+            log_dirs = self.parser.get_log_directories()
+            cutoff_str = self.parser.get_cutoff_date_str()
+            
+            # Changed files go to the worker pool while the directory walk continues
+            files_processed = self.process_log_files(self.find_changed_files(log_dirs, cutoff_str))
             
             # Only save state if we actually processed files
             if files_processed > 0:
@@ -584,10 +775,8 @@ class LogForwarder:
                     
                     # Rotate our own logs if they get too large (every 30 minutes)
                     if (now - last_log_rotation_check).total_seconds() > 1800:  # 30 minutes
-                        log_files = logging.root.handlers
-                        for handler in log_files:
-                            if isinstance(handler, logging.FileHandler):
-                                rotate_logs(handler.baseFilename, self.logger)
+                        for log_path in get_registered_log_files():
+                            rotate_logs(log_path, self.logger)
                         last_log_rotation_check = now
                     
                 except Exception as e:
@@ -621,4 +810,7 @@ class LogForwarder:
                 self.logger.error(f"Error stopping observer for {directory}: {str(e)}")
         
         self.observers.clear()
+        
+        # Let any in-flight parsing finish
+        self.parse_executor.shutdown(wait=True)
         self.logger.info("Log monitoring stopped.")
\ No newline at end of file
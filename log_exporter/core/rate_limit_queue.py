@@ -1,6 +1,5 @@
 import time
 import threading
-import queue
 import logging
 from collections import deque
 from datetime import datetime, timedelta
@@ -23,7 +22,8 @@ class RateLimitQueue:
             max_queue_size (int): Maximum size of the queue before oldest items are dropped
         """
         self.logger = logging.getLogger("RateLimitQueue")
-        self.queue = deque()
+        # Bounded deque: appending to a full queue drops the oldest entry without blocking
+        self.queue = deque(maxlen=max_queue_size)
         self.lock = threading.RLock()  # Reentrant lock for thread safety
         self.rate_limit = rate_limit
         self.rate_window = rate_window
@@ -51,9 +51,8 @@ class RateLimitQueue:
             bool: True if the entry was added, False if the queue is full and it was dropped
         """
         with self.lock:
-            # If queue is at max capacity, drop the oldest item
+            # If queue is at max capacity, the deque drops the oldest item
             if len(self.queue) >= self.max_queue_size:
-                self.queue.popleft()  # Remove oldest item
                 self.total_dropped += 1
                 self.logger.warning(f"Queue full, dropped oldest log entry. Total dropped: {self.total_dropped}")
             
@@ -78,12 +77,24 @@ class RateLimitQueue:
         Returns:
             int: Number of entries successfully added to the queue
         """
+        log_entries = list(log_entries)
+        if not log_entries:
+            return 0
+            
         with self.lock:
-            added_count = 0
-            for entry in log_entries:
-                if self.add(entry):
-                    added_count += 1
-            return added_count
+            # Work out how many of the oldest entries the deque will drop
+            overflow = len(self.queue) + len(log_entries) - self.max_queue_size
+            if overflow > 0:
+                self.total_dropped += overflow
+                self.logger.warning(f"Queue full, dropped {overflow} oldest log entries. Total dropped: {self.total_dropped}")
+            
+            # Add all entries in one call
+            self.queue.extend(log_entries)
+            self.total_queued += len(log_entries)
+            
+            self.logger.info(f"Queue size: {len(self.queue)}")
+            
+            return len(log_entries)
     
     def is_rate_limited(self):
         """
@@ -218,4 +229,57 @@ class RateLimitQueue:
                 'retry_attempts': self.retry_attempts,
                 'rate_limited': self.rate_limited,
                 'rate_limit_reset': self.rate_limit_reset.isoformat() if self.rate_limit_reset else None
-            }
\ No newline at end of file
+            }
+
+class TokenBucket:
+    """
+    Token bucket for pacing requests before the API starts rejecting them.
+    
+    Tokens refill continuously at rate_limit per rate_window seconds, up to a
+    burst of rate_limit. Each request takes a token, and callers only sleep
+    for as long as it takes the next token to arrive.
+    """
+    
+    def __init__(self, rate_limit=120, rate_window=60):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate_limit (int): Number of requests allowed per window
+            rate_window (int): Time window in seconds
+        """
+        self.capacity = max(1, rate_limit)
+        self.refill_rate = self.capacity / max(rate_window, 1)
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self, now):
+        """Add the tokens earned since the last refill"""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.last_refill = now
+    
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, sleeping only as long as needed.
+        
+        Args:
+            tokens (int): Number of tokens to take
+            
+        Returns:
+            float: Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait_seconds = (tokens - self.tokens) / self.refill_rate
+            time.sleep(wait_seconds)
+            waited += wait_seconds
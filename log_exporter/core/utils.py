@@ -1,8 +1,34 @@
 import os
+import json
 import time
 import logging
 from datetime import datetime
 
+# orjson is optional; it serializes entries several times faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# File handlers installed by the application, keyed by log path, along with
+# the logger each one is attached to. Lets rotate_logs find the handler
+# directly instead of walking logging.root.handlers.
+_FILE_HANDLERS = {}
+
+def register_file_handler(handler, owner=None):
+    """Remember a FileHandler so it can be rotated later"""
+    _FILE_HANDLERS[handler.baseFilename] = (handler, owner or logging.root)
+
+def get_registered_log_files():
+    """Get the paths of all registered file handlers"""
+    return list(_FILE_HANDLERS)
+
+def encode_json(data):
+    """Serialize data to a UTF-8 JSON request body, using orjson when it's installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
 def create_lock_file(lock_path):
     """Create a lock file with the current timestamp"""
     try:
@@ -70,6 +96,17 @@ def cleanup_stale_locks(data_dir):
         logger.error(f"Error cleaning up stale locks: {str(e)}")
         return 0
 
+def line_count_to_offset(file_path, line_count):
+    """Convert a number of processed lines into the byte offset where they end"""
+    offset = 0
+    with open(file_path, 'rb') as f:
+        for _ in range(line_count):
+            line = f.readline()
+            if not line:
+                break
+            offset += len(line)
+    return offset
+
 def rotate_logs(log_path, logger):
     """Rotate log files when they get too large"""
     try:
@@ -79,26 +116,25 @@ def rotate_logs(log_path, logger):
             timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
             backup_path = f"{log_path}.{timestamp}"
             
-            # Get all logging handlers for this file
-            log_handlers = []
-            for handler in logging.root.handlers:
-                if isinstance(handler, logging.FileHandler) and handler.baseFilename == log_path:
-                    log_handlers.append(handler)
+            # Look up the registered handler for this file
+            registered = _FILE_HANDLERS.get(log_path)
             
-            # Close and reopen the log file handlers
-            for handler in log_handlers:
+            # Close the log file handler
+            if registered:
+                handler, owner = registered
                 handler.close()
-                logging.root.removeHandler(handler)
+                owner.removeHandler(handler)
             
             # Rename the current log file
             os.rename(log_path, backup_path)
             
             # Create a new log file and add handler
-            for handler in log_handlers:
+            if registered:
                 new_handler = logging.FileHandler(log_path)
                 new_handler.setFormatter(handler.formatter)
                 new_handler.setLevel(handler.level)
-                logging.root.addHandler(new_handler)
+                owner.addHandler(new_handler)
+                register_file_handler(new_handler, owner)
             
             # Delete old log files if there are more than 5
             log_backups = [f for f in os.listdir(os.path.dirname(log_path)) 
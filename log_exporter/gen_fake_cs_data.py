@@ -4,6 +4,7 @@ import random
 import datetime
 import argparse
 import os
+from operator import itemgetter
 from typing import List, Dict, Tuple
 
 # Define possible domains, usernames, computer names, and IP addresses
@@ -105,6 +106,19 @@ ADVANCED_COMMANDS = [
     "elevate {0}"
 ]
 
+# Commands that get a "tasked" line and commands that produce output, tagged
+# once per template so generate_beacon_entry doesn't rescan every command
+TASK_COMMANDS = ("hashdump", "mimikatz", "screenshot", "keylogger", "dcsync")
+NO_OUTPUT_COMMANDS = ("sleep", "checkin", "cd", "exit", "screenshot", "bypassuac", "elevate")
+
+def command_flags(command: str) -> Tuple[bool, bool]:
+    command_lower = command.lower()
+    needs_task = any(cmd in command_lower for cmd in TASK_COMMANDS)
+    needs_output = not any(cmd in command_lower for cmd in NO_OUTPUT_COMMANDS)
+    return needs_task, needs_output
+
+TEMPLATE_FLAGS = {tpl: command_flags(tpl) for tpl in SIMPLE_COMMANDS + ADVANCED_COMMANDS}
+
 # Generate random IPs based on the ranges
 def random_ip() -> str:
     ip_range = random.choice(IP_RANGES)
@@ -258,9 +272,12 @@ def generate_beacon_entry(beacon_id: int, domain: str, username: str, hostname:
         # Fallback to a simple command with no placeholders
         fallback_commands = [cmd for cmd in SIMPLE_COMMANDS if "{" not in cmd]
         if fallback_commands:
-            command = random.choice(fallback_commands)
+            command_template = random.choice(fallback_commands)
         else:
-            command = "shell whoami"  # Ultimate fallback
+            command_template = "shell whoami"  # Ultimate fallback
+        command = command_template
+    
+    needs_task, needs_output = TEMPLATE_FLAGS[command_template]
     
     # Prepare the user string based on domain
     if domain in ["NT AUTHORITY", "NT SERVICE", "LOCAL SERVICE", "NETWORK SERVICE"] and not username:
@@ -281,7 +298,7 @@ def generate_beacon_entry(beacon_id: int, domain: str, username: str, hostname:
     })
     
     # Add task entry for certain commands
-    if any(cmd in command.lower() for cmd in ["hashdump", "mimikatz", "screenshot", "keylogger", "dcsync"]):
+    if needs_task:
         entries.append({
             "time": (timestamp + datetime.timedelta(seconds=random.randint(1, 5))).strftime("%H:%M:%S"),
             "beacon_id": beacon_id,
@@ -290,7 +307,7 @@ def generate_beacon_entry(beacon_id: int, domain: str, username: str, hostname:
         })
     
             # Add output for most commands
-    if not any(cmd in command.lower() for cmd in ["sleep", "checkin", "cd", "exit", "screenshot", "bypassuac", "elevate"]):
+    if needs_output:
         output_time = timestamp + datetime.timedelta(seconds=random.randint(2, 7))
         output_time_str = output_time.strftime("%H:%M:%S")
         
@@ -341,13 +358,17 @@ def generate_beacon_entry(beacon_id: int, domain: str, username: str, hostname:
 
 # Format and write entries to the log file
 def write_beacon_log(entries: List[Dict[str, str]], output_file: str) -> None:
-    with open(output_file, 'w') as f:
-        for entry in entries:
-            if entry["type"] == "command":
-                line = f"[{entry['time']}] Beacon {entry['beacon_id']} ({entry['user']}@{entry['host']}): {entry['command']}"
-            else:
-                line = f"[{entry['time']}] {entry['message']}"
-            f.write(line + "\n")
+    # Build all lines first and hand them to the file in one call
+    lines = []
+    append = lines.append
+    for entry in entries:
+        if entry["type"] == "command":
+            append(f"[{entry['time']}] Beacon {entry['beacon_id']} ({entry['user']}@{entry['host']}): {entry['command']}\n")
+        else:
+            append(f"[{entry['time']}] {entry['message']}\n")
+    
+    with open(output_file, 'w', buffering=1024 * 1024) as f:
+        f.writelines(lines)
 
 def generate_beacon_log(num_beacons: int, num_entries: int, output_dir: str) -> None:
     # Create output directory if it doesn't exist
@@ -425,7 +446,7 @@ def generate_beacon_log(num_beacons: int, num_entries: int, output_dir: str) ->
             })
     
     # Sort all entries by timestamp
-    all_entries.sort(key=lambda entry: entry["time"])
+    all_entries.sort(key=itemgetter("time"))
     
     # Write to file
     output_file = os.path.join(date_dir, f"beacon_{random.randint(100000, 999999)}.log")
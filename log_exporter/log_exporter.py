@@ -10,6 +10,7 @@ import traceback
 from datetime import datetime
 
 from core.forwarder import LogForwarder
+from core.utils import register_file_handler
 from parsers.cobalt_strike import CobalStrikeParser
 from parsers.sliver import SliverParser
 
@@ -28,15 +29,19 @@ def setup_logging(log_dir, debug=False):
     else:
         log_format = '%(asctime)s - %(levelname)s - %(message)s'
     
+    file_handler = logging.FileHandler(log_file)
     logging.basicConfig(
         level=log_level,
         format=log_format,
         handlers=[
-            logging.FileHandler(log_file),
+            file_handler,
             logging.StreamHandler()
         ]
     )
     
+    # Register the file handler so log rotation can find it directly
+    register_file_handler(file_handler)
+    
     # Set external libraries to a higher log level to reduce noise
     if debug:
         logging.getLogger('watchdog').setLevel(logging.INFO)
@@ -72,6 +77,8 @@ def parse_arguments():
                         help="Rate limit window in seconds (default: 60)")
     parser.add_argument("--max-queue-size", type=int, default=10000,
                         help="Maximum size of the queue (default: 10000)")
+    parser.add_argument("--parse-processes", type=int, default=0,
+                        help="Parse log files in this many worker processes (default: 0, parse in threads)")
 
     # Add new filtering options (mutually exclusive)
     filter_group = parser.add_mutually_exclusive_group()
@@ -158,7 +165,8 @@ def main():
             verify_ssl=not args.insecure_ssl,
             rate_limit=args.rate_limit,
             rate_window=args.rate_window,
-            max_queue_size=args.max_queue_size
+            max_queue_size=args.max_queue_size,
+            parse_processes=args.parse_processes
         )
         
         # Register signal handlers
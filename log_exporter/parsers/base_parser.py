@@ -2,7 +2,39 @@ import os
 import logging
 import re
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+# Command filters are resolved once at import time rather than inside the per-entry methods
+try:
+    from parsers.command_filters import get_insignificant_commands
+except ImportError:
+    get_insignificant_commands = None
+
+try:
+    from parsers.command_filters import should_exclude_command
+except ImportError:
+    should_exclude_command = None
+
+# Upper bound on remembered is_significant_command results; the cache is
+# cleared when it fills up so commands with unique arguments can't grow it forever
+SIGNIFICANCE_CACHE_SIZE = 4096
+
+# Date directory names look like YYYY-MM-DD
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+def is_date_string(name):
+    """
+    Check if a string is a YYYY-MM-DD date
+    
+    Cheap length and separator checks reject most names before the regex runs.
+    
+    Args:
+        name: String to check, usually a directory name
+        
+    Returns:
+        bool: True if the string looks like a date, False otherwise
+    """
+    return len(name) == 10 and name[4] == '-' and name[7] == '-' and _DATE_RE.match(name) is not None
 
 class BaseLogParser(ABC):
     """
@@ -15,6 +47,14 @@ class BaseLogParser(ABC):
     The default implementations of some methods assume date-based directories (YYYY-MM-DD format),
     but each parser can override these methods if their C2 framework uses a different structure.
     """
+    
+    # Whether processed_lines holds byte offsets (True) or line counts (False)
+    tracks_byte_offsets = False
+    
+    # Whether files can be parsed in separate processes (any state shared between
+    # files goes through get_shared_state/merge_shared_state)
+    supports_process_pool = False
+    
     def __init__(self, root_dir, historical_days=1, max_tracked_days=2, filter_mode="all"):
         self.root_dir = os.path.abspath(root_dir)
         self.historical_days = historical_days
@@ -22,8 +62,41 @@ class BaseLogParser(ABC):
         self.filter_mode = filter_mode
         self.logger = logging.getLogger(self.__class__.__name__)
         
+        # Get the class name without "Parser" suffix to determine C2 type
+        self.framework_type = self.__class__.__name__.lower().replace('parser', '')
+        
+        # Special case handling for class names that don't match framework types
+        if self.framework_type == "cobalstrike":
+            self.framework_type = "cobalt_strike"
+        
+        # Exclusion function from command_filters, if it provides one
+        self.should_exclude_command = should_exclude_command
+        if self.should_exclude_command is None:
+            # Fallback to basic exclusion if command_filters doesn't provide it
+            self.logger.warning("command_filters exclusion rules not found, using basic exclusion logic")
+        
         # Initialize insignificant commands list (to be overridden by subclasses)
         self.insignificant_commands = []
+        self.insignificant_command_set = frozenset()
+        self.insignificant_regex = None
+        
+        # is_significant_command results by command string
+        self.significance_cache = {}
+        
+        # Log directories found today (parsers that can cache them fill this in)
+        self.log_dirs_cache = None
+        self.log_dirs_cache_date = None
+        
+        # Dates that create_iso_timestamp has already validated
+        self.valid_timestamp_dates = set()
+        
+        # Last (date_str, time_str, timestamp) built on the fast path; consecutive
+        # lines often share a timestamp. One tuple, so threads never see half an update.
+        self.last_iso_timestamp = (None, None, None)
+        
+        # Pruning cutoff date string, recomputed when the day changes
+        self.cutoff_date_cache = None
+        self.cutoff_date_cache_day = None
         
         # Log filter mode
         self.logger.info(f"Using filter mode: {self.filter_mode}")
@@ -71,7 +144,8 @@ class BaseLogParser(ABC):
         
         Args:
             log_file: Path to the log file
-            processed_lines: Dictionary of file paths to line counts already processed
+            processed_lines: Dictionary of file paths to the position already processed
+                (line counts, or byte offsets when tracks_byte_offsets is set)
             
         Returns:
             list: List of extracted log entries
@@ -83,26 +157,44 @@ class BaseLogParser(ABC):
         Initialize the list of insignificant commands to filter out when in 'significant' mode
         Loads commands from the command_filters module based on C2 framework type.
         """
-        try:
-            # Import here to avoid circular imports
-            from command_filters import get_insignificant_commands
-            
-            # Get the class name without "Parser" suffix to determine C2 type
-            framework_type = self.__class__.__name__.lower().replace('parser', '')
-            
-            # Special case handling for class names that don't match framework types
-            if framework_type == "cobalstrike":
-                framework_type = "cobalt_strike"
-                
+        if get_insignificant_commands is not None:
             # Load commands for this framework
-            self.insignificant_commands = get_insignificant_commands(framework_type)
-            self.logger.debug(f"Loaded {len(self.insignificant_commands)} insignificant commands for {framework_type}")
-        except ImportError:
+            self.insignificant_commands = get_insignificant_commands(self.framework_type)
+            self.logger.debug(f"Loaded {len(self.insignificant_commands)} insignificant commands for {self.framework_type}")
+        else:
             # Fallback to basic list if command_filters module is not available
             self.logger.warning("command_filters module not found, using basic command filter list")
             self.insignificant_commands = [
                 "ls", "dir", "pwd", "cd", "cls", "clear", "help", "?", "exit", "quit"
             ]
+        
+        # Single-word commands are an O(1) lookup on the first word; only the
+        # few multi-word ones (e.g. "reg query") still need the regex
+        single_word = [command for command in self.insignificant_commands if len(command.split()) == 1]
+        multi_word = [command for command in self.insignificant_commands if len(command.split()) > 1]
+        self.insignificant_command_set = frozenset(command.lower() for command in single_word)
+        self.insignificant_regex = self.build_insignificant_regex(multi_word)
+        
+        # Results cached against the old lists no longer apply
+        self.significance_cache.clear()
+    
+    def build_insignificant_regex(self, commands):
+        """
+        Compile the insignificant commands into a single anchored pattern
+        
+        Args:
+            commands: List of insignificant command strings
+            
+        Returns:
+            re.Pattern: Pattern matching a command that is, or starts with, one of the commands
+        """
+        if not commands:
+            return None
+        # Longest first, so "mode dns-txt" is tried before "mode dns" and the
+        # engine settles on the right alternative without backtracking into the next
+        ordered = sorted(set(commands), key=len, reverse=True)
+        alternation = '|'.join(re.escape(command) for command in ordered)
+        return re.compile(r'(?:' + alternation + r')(?:\s|$)', re.IGNORECASE)
     
     def should_exclude_entry(self, entry):
         """
@@ -117,22 +209,10 @@ class BaseLogParser(ABC):
         if not entry or "command" not in entry:
             return True
             
-        try:
-            # Import here to avoid circular imports
-            from command_filters import should_exclude_command
-            
-            # Get the class name without "Parser" suffix to determine C2 type
-            framework_type = self.__class__.__name__.lower().replace('parser', '')
-            
-            # Special case handling for class names that don't match framework types
-            if framework_type == "cobalstrike":
-                framework_type = "cobalt_strike"
-                
-            return should_exclude_command(entry["command"], framework_type)
-        except ImportError:
-            # Fallback to basic exclusion if command_filters module is not available
-            self.logger.warning("command_filters module not found, using basic exclusion logic")
+        if self.should_exclude_command is None:
             return False
+            
+        return self.should_exclude_command(entry["command"], self.framework_type)
     
     def is_significant_command(self, command):
         """
@@ -149,17 +229,234 @@ class BaseLogParser(ABC):
             
         if not command:
             return False
+        
+        # Operators repeat the same commands constantly, so most lookups end here
+        significant = self.significance_cache.get(command)
+        if significant is not None:
+            return significant
+            
+        # Match exact command or command with arguments by its first word,
+        # falling back to the regex for multi-word commands
+        stripped = command.strip()
+        first_word = stripped.split(None, 1)[0].lower() if stripped else ''
+        significant = not (first_word in self.insignificant_command_set or (
+            self.insignificant_regex is not None and self.insignificant_regex.match(stripped)))
+        if not significant:
+            self.logger.debug("Filtering out insignificant command: %s", command)
+        
+        if len(self.significance_cache) >= SIGNIFICANCE_CACHE_SIZE:
+            self.significance_cache.clear()
+        self.significance_cache[command] = significant
+        return significant
+    
+    def extract_date_from_path(self, file_path):
+        """
+        Extract the date from a log file path (e.g., logs/2025-03-31/beacon_123.log)
+        
+        Log files normally sit directly in their date directory, so the parent
+        directory name is checked first before falling back to the other components.
+        
+        Args:
+            file_path: Path to the log file
+            
+        Returns:
+            str: Date in ISO format (YYYY-MM-DD), today's date if none is found
+        """
+        parent_name = os.path.basename(os.path.dirname(file_path))
+        if is_date_string(parent_name):
+            return parent_name
+        
+        for part in file_path.split(os.sep):
+            if is_date_string(part):
+                return part
+        
+        # If no date found in path, use today's date
+        return date.today().isoformat()
+    
+    def create_iso_timestamp(self, date_str, time_str):
+        """
+        Create an ISO format timestamp from date string and time string
+        
+        Args:
+            date_str: String in format YYYY-MM-DD
+            time_str: String in format HH:MM:SS
+            
+        Returns:
+            String: ISO format timestamp (YYYY-MM-DDTHH:MM:SS)
+        """
+        last_date, last_time, last_timestamp = self.last_iso_timestamp
+        if time_str == last_time and date_str == last_date:
+            return last_timestamp
+        
+        # Clean up time string (remove milliseconds if present)
+        clean_time = time_str.partition('.')[0]
+        
+        # A well-formed HH:MM:SS on a date that already parsed once needs no
+        # datetime round-trip, it is already in ISO format
+        if (date_str in self.valid_timestamp_dates and len(clean_time) == 8
+                and clean_time[2] == ':' and clean_time[5] == ':'
+                and clean_time.isascii() and clean_time.replace(':', '').isdigit()
+                and clean_time[:2] < '24' and clean_time[3:5] < '60' and clean_time[6:] < '60'):
+            timestamp = f"{date_str}T{clean_time}"
+            self.last_iso_timestamp = (date_str, time_str, timestamp)
+            return timestamp
+        
+        try:
+            # For short times like '00:01:23', ensure we have proper formatting
+            time_parts = clean_time.split(':')
+            if len(time_parts) == 3:
+                # Full time with hours, minutes, seconds
+                formatted_time = clean_time
+            elif len(time_parts) == 2:
+                # Missing seconds
+                formatted_time = f"{clean_time}:00"
+            else:
+                # Invalid format, use current time
+                formatted_time = datetime.now().strftime("%H:%M:%S")
+            
+            # Combine date and time
+            timestamp = f"{date_str}T{formatted_time}"
+            
+            # Validate by parsing
+            dt = datetime.fromisoformat(timestamp)
+            self.valid_timestamp_dates.add(date_str)
             
-        # Check if the command starts with any insignificant command
-        command_lower = command.lower().strip()
+            # Return ISO format
+            return dt.isoformat()
+        except Exception as e:
+            # If there's any error, fallback to current time
+            self.logger.error(f"Error creating timestamp from {date_str} {time_str}: {str(e)}")
+            return datetime.now().isoformat()
+    
+    def iter_log_files(self, directory, cutoff_str):
+        """
+        Iterate over the valid log files in a directory
         
-        for insignificant in self.insignificant_commands:
-            # Match exact command or command with arguments
-            if command_lower == insignificant or command_lower.startswith(f"{insignificant} "):
-                self.logger.debug(f"Filtering out insignificant command: {command}")
-                return False
+        Uses os.scandir so each entry's name and stat result come from the
+        directory listing instead of separate path lookups.
         
-        return True
+        Args:
+            directory: Path to the directory
+            cutoff_str: Cutoff date string in ISO format (YYYY-MM-DD)
+            
+        Yields:
+            os.DirEntry: Entry for each valid log file
+        """
+        # Every file in an outdated date directory is outdated too
+        if self.is_directory_outdated(directory, cutoff_str):
+            return
+            
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and self.is_valid_log_file(entry.path):
+                    yield entry
+    
+    def get_resume_offset(self, position, file_stat):
+        """
+        Work out the byte offset to resume reading a log file from
+
+        Positions are stored together with the (st_dev, st_ino) of the file
+        they were taken from. If a different file now sits at the same path
+        (the old one was rotated away) or the file shrank, reading starts
+        over at 0 instead of skipping into data that was never seen.
+
+        Args:
+            position: Stored position for the file (dict, bare offset or None)
+            file_stat: os.stat_result of the open file
+
+        Returns:
+            int: Byte offset to seek to
+        """
+        if position is None:
+            return 0
+
+        if isinstance(position, dict):
+            if position.get('inode') != (file_stat.st_dev, file_stat.st_ino):
+                self.logger.info("Log file was replaced since the last poll, re-reading from the start")
+                return 0
+            offset = position.get('offset', 0)
+        else:
+            # Bare offset from state saved before inodes were recorded
+            offset = position
+
+        if offset > file_stat.st_size:
+            self.logger.info("Log file was truncated, re-reading from the start")
+            return 0
+
+        return offset
+
+    def make_position(self, offset, file_stat):
+        """
+        Build the processed_lines value for a byte offset
+
+        Args:
+            offset: Byte offset reached in the file
+            file_stat: os.stat_result of the file that was read
+
+        Returns:
+            dict: Position record with the offset and the file's inode, size and mtime
+        """
+        return {
+            'offset': offset,
+            'inode': (file_stat.st_dev, file_stat.st_ino),
+            'size': file_stat.st_size,
+            'mtime_ns': file_stat.st_mtime_ns,
+        }
+
+    def is_position_current(self, position, file_stat):
+        """
+        Check if a stored position already covers the whole file
+
+        Args:
+            position: Stored position for the file
+            file_stat: os.stat_result of the file
+
+        Returns:
+            bool: True if the file is unchanged since it was read to the end
+        """
+        return (isinstance(position, dict)
+                and position.get('inode') == (file_stat.st_dev, file_stat.st_ino)
+                and position.get('offset') == file_stat.st_size
+                and position.get('size') == file_stat.st_size
+                and position.get('mtime_ns') == file_stat.st_mtime_ns)
+
+    def get_shared_state(self):
+        """
+        Get the state parse_log_file keeps across files, for parse worker processes
+        
+        Returns:
+            object: Picklable state to hand to merge_shared_state, or None if the parser keeps none
+        """
+        return None
+    
+    def get_shared_state_changes(self, previous_state):
+        """
+        Get the part of the shared state that changed since previous_state was taken
+        
+        A parse worker process returns only these changes, so the state it was handed
+        at the start of a job can't overwrite anything the main process learned since.
+        
+        Args:
+            previous_state: Value returned by get_shared_state before the job
+            
+        Returns:
+            object: Picklable state to hand to merge_shared_state, or None if the parser keeps none
+        """
+        return None
+    
+    def merge_shared_state(self, state):
+        """
+        Fold state from get_shared_state or get_shared_state_changes in another process into this parser
+        
+        Args:
+            state: Value returned by get_shared_state or get_shared_state_changes
+        """
+        pass
+    
+    def invalidate_log_dirs_cache(self):
+        """Force the next get_log_directories call to look at the filesystem again"""
+        self.log_dirs_cache = None
+        self.log_dirs_cache_date = None
     
     def get_cutoff_date_str(self):
         """
@@ -168,9 +465,12 @@ class BaseLogParser(ABC):
         Returns:
             str: Cutoff date in ISO format (YYYY-MM-DD)
         """
-        today = datetime.now().date()
-        cutoff_date = today - timedelta(days=self.max_tracked_days)
-        return cutoff_date.strftime("%Y-%m-%d")
+        # The cutoff only moves when the day changes, so compute it once per day
+        today = date.today()
+        if self.cutoff_date_cache_day != today:
+            self.cutoff_date_cache = (today - timedelta(days=self.max_tracked_days)).isoformat()
+            self.cutoff_date_cache_day = today
+        return self.cutoff_date_cache
     
     def is_file_outdated(self, file_path, cutoff_str):
         """
@@ -189,7 +489,7 @@ class BaseLogParser(ABC):
         dir_name = os.path.basename(dir_path)
         
         # Check if the directory name looks like a date older than cutoff
-        return (re.match(r'^\d{4}-\d{2}-\d{2}$', dir_name) and dir_name < cutoff_str)
+        return is_date_string(dir_name) and dir_name < cutoff_str
     
     def is_directory_outdated(self, directory, cutoff_str):
         """
@@ -205,7 +505,7 @@ class BaseLogParser(ABC):
         # Default implementation checks if the directory name is a date
         # that's older than the cutoff date
         dir_name = os.path.basename(directory)
-        return (re.match(r'^\d{4}-\d{2}-\d{2}$', dir_name) and dir_name < cutoff_str)
+        return is_date_string(dir_name) and dir_name < cutoff_str
     
     def is_date_directory(self, directory):
         """
@@ -218,4 +518,4 @@ class BaseLogParser(ABC):
             bool: True if the directory is a date directory, False otherwise
         """
         dir_name = os.path.basename(directory)
-        return re.match(r'^\d{4}-\d{2}-\d{2}$', dir_name) is not None
\ No newline at end of file
+        return is_date_string(dir_name)
\ No newline at end of file
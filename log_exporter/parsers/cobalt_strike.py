@@ -1,24 +1,90 @@
 import os
 import re
+import stat
+import mmap
 import logging
-import traceback
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 
-from parsers.base_parser import BaseLogParser
+from parsers.base_parser import BaseLogParser, is_date_string
+
+# Notes attached to every Beacon command entry
+NOTES_TEMPLATE = "Beacon ID: %s, Local time: %s"
+
+# Beacon command lines, found directly in the mapped file bytes. The first alternative
+# captures the fields of a well-formed "[time] Beacon ID (user@host): command" line so
+# only those slices get decoded. The second catches any other line that could still be
+# a command (it starts with "[" and has "):" after "Beacon"); those are decoded whole
+# and handed to split_beacon_command. Output lines like "Beacon ID received output:"
+# match neither. [^\S\n] is whitespace that stays on the same line.
+BEACON_LINE_RE = re.compile(
+    rb'^(?:\[([^\]\n]*)\][^\S\n]+Beacon[^\S\n]+(\d+)[^\S\n]+\(([^@\n]+)@([^)\n]+)\):[^\S\r\n][^\S\n]*(.*?)\r*'
+    rb'|\[.*Beacon.*\):.*)$',
+    re.MULTILINE)
+
+# Regex for Beacon commands, used when split_beacon_command can't handle a line.
+# Format: [time] Beacon ID (user@host): command
+# Each field is a negated character class up to its delimiter, so nothing backtracks.
+BEACON_CMD_RE = re.compile(r"\[([^\]]*)\]\s+Beacon\s+(\d+)\s+\(([^@]+)@([^)]+)\):\s+(.*)")
+
+def split_beacon_command(line):
+    """
+    Split a Beacon command line into its fields with plain string scans
+    
+    Format: [time] Beacon ID (user@host): command
+    
+    Args:
+        line: Log line without its trailing newline
+        
+    Returns:
+        tuple: (time, beacon_id, username, hostname, command), or None if the line doesn't fit the format
+    """
+    if not line.startswith('['):
+        return None
+    time_end = line.find(']')
+    if time_end == -1:
+        return None
+    time_str = line[1:time_end]
+    
+    # "Beacon" has to be surrounded by whitespace
+    rest = line[time_end + 1:]
+    stripped = rest.lstrip()
+    if stripped is rest or not stripped.startswith('Beacon'):
+        return None
+    parts = stripped[6:].split(None, 1)
+    if len(parts) != 2 or not stripped[6:7].isspace():
+        return None
+    beacon_id, rest = parts
+    if not beacon_id.isdecimal() or not rest.startswith('('):
+        return None
+    
+    # user@host, where the host ends at the first "):" followed by whitespace
+    at = rest.find('@', 2)
+    if at == -1:
+        return None
+    close = rest.find('):', at + 2)
+    while close != -1 and not rest[close + 2:close + 3].isspace():
+        close = rest.find('):', close + 1)
+    if close == -1:
+        return None
+    command = rest[close + 2:].lstrip()
+    
+    return time_str, beacon_id, rest[1:at], rest[at + 1:close], command
 
 class CobalStrikeParser(BaseLogParser):
     """Parser for Cobalt Strike beacon logs"""
     
+    # processed_lines holds byte offsets (with the file's inode) for this parser
+    tracks_byte_offsets = True
+    
+    # Each beacon log is parsed on its own, so files can go to worker processes
+    supports_process_pool = True
+    
     def __init__(self, root_dir, historical_days=1, max_tracked_days=2, filter_mode="all"):
         super().__init__(root_dir, historical_days, max_tracked_days, filter_mode)
         
         # Set up paths relative to the Cobalt Strike root
         self.cs_logs_base_dir = os.path.join(self.root_dir, "logs")
         
-        # Main regex pattern for parsing Beacon commands
-        # Format: [time] Beacon ID (user@host): command
-        self.beacon_cmd_regex = re.compile(r"\[(.*?)\]\s+Beacon\s+(\d+)\s+\((.+?)@(.+?)\):\s+(.*)")
-        
         self.logger.info(f"Initialized Cobalt Strike Parser")
         self.logger.info(f"- Logs base directory: {self.cs_logs_base_dir}")
         self.logger.info(f"- Historical days to process: {self.historical_days}")
@@ -30,53 +96,50 @@ class CobalStrikeParser(BaseLogParser):
     
     def get_log_directories(self):
         """Get all log directories to monitor, including historical ones if specified"""
-        log_dirs = []
+        # Get today's date
+        today = date.today()
         
-        # Verify the base logs directory exists
-        if not os.path.exists(self.cs_logs_base_dir):
+        # The directory list only changes when the day rolls over or a new
+        # date directory shows up, so reuse it for the rest of the day
+        if self.log_dirs_cache is not None and self.log_dirs_cache_date == today:
+            return self.log_dirs_cache
+        
+        # Read the base directory once and collect the date directories in it
+        try:
+            with os.scandir(self.cs_logs_base_dir) as entries:
+                date_dirs = {entry.name for entry in entries if entry.is_dir() and is_date_string(entry.name)}
+        except FileNotFoundError:
             self.logger.error(f"Logs base directory does not exist: {self.cs_logs_base_dir}")
             self.logger.error(f"Make sure you're running this script from the Cobalt Strike root directory.")
             return []
         
-        # Get today's date
-        today = datetime.now().date()
+        # Today and yesterday are always monitored; older days only if specifically
+        # requested AND they're within max_tracked_days
+        days_back = 1
+        if self.historical_days > 1:
+            days_back += max(0, min(self.historical_days - 1, self.max_tracked_days - 1))
         
-        # Always include today's directory
-        today_str = today.strftime("%Y-%m-%d")
+        # ISO date names sort chronologically, so the window is a plain string range
+        today_str = today.isoformat()
+        min_date_str = (today - timedelta(days=days_back)).isoformat()
         today_dir = os.path.join(self.cs_logs_base_dir, today_str)
-        log_dirs.append(today_dir)
-        
-        # Add yesterday's directory (always most relevant for recent activity)
-        yesterday = today - timedelta(days=1)
-        yesterday_str = yesterday.strftime("%Y-%m-%d")
-        yesterday_dir = os.path.join(self.cs_logs_base_dir, yesterday_str)
-        if os.path.exists(yesterday_dir):
-            log_dirs.append(yesterday_dir)
-        
-        # Only add more historical directories if specifically requested AND they're within max_tracked_days
-        if self.historical_days > 1:
-            # Calculate how many additional days to include beyond yesterday
-            additional_days = min(self.historical_days - 1, self.max_tracked_days - 1)
-            if additional_days > 0:
-                for i in range(2, additional_days + 2):  # Start from 2 days ago
-                    past_date = today - timedelta(days=i)
-                    past_dir = os.path.join(self.cs_logs_base_dir, past_date.strftime("%Y-%m-%d"))
-                    if os.path.exists(past_dir):
-                        log_dirs.append(past_dir)
         
         # Log all directories found
-        existing_dirs = [d for d in log_dirs if os.path.exists(d)]
+        existing_dirs = [os.path.join(self.cs_logs_base_dir, d)
+                         for d in sorted(date_dirs, reverse=True) if min_date_str <= d <= today_str]
         self.logger.info(f"Found {len(existing_dirs)} log directories to monitor:")
         for d in existing_dirs:
             self.logger.info(f"  - {d}")
+        
+        # Only cache once today's directory exists, otherwise we'd miss it when Cobalt Strike creates it
+        if today_dir in existing_dirs:
+            self.log_dirs_cache = existing_dirs
+            self.log_dirs_cache_date = today
             
         return existing_dirs
     
     def is_valid_log_file(self, file_path):
         """Check if a file is a valid Cobalt Strike beacon log file"""
-        if not os.path.exists(file_path) or os.path.isdir(file_path):
-            return False
-            
         # Only process files that look like beacon logs
         file_name = os.path.basename(file_path)
         if not file_name.endswith('.log'):
@@ -85,6 +148,14 @@ class CobalStrikeParser(BaseLogParser):
         if not (file_name.startswith("beacon_") or "beacon" in file_name.lower()):
             return False
         
+        # One stat answers both "does it exist" and "is it a directory",
+        # and it only runs for names that passed the checks above
+        try:
+            if stat.S_ISDIR(os.stat(file_path).st_mode):
+                return False
+        except OSError:
+            return False
+        
         return True
     
     def parse_log_file(self, log_file, processed_lines):
@@ -92,141 +163,127 @@ class CobalStrikeParser(BaseLogParser):
         # Convert to absolute path for consistency
         abs_log_file = os.path.abspath(log_file)
         
-        # Get previously processed lines count
-        if abs_log_file not in processed_lines:
-            processed_lines[abs_log_file] = 0
-        
-        line_count = 0
+        # Previously processed position (byte offset plus the file's inode, size and mtime)
+        position = processed_lines.get(abs_log_file)
         new_entries = []
         
+        # Per-line debug output is only formatted when debug logging is on
+        debug_on = self.logger.isEnabledFor(logging.DEBUG)
+        
         self.logger.debug(f"Starting to parse file: {abs_log_file}")
-        self.logger.debug(f"Previously processed {processed_lines.get(abs_log_file, 0)} lines")
         
         try:
+            # A file that hasn't changed since it was fully read costs one stat, not an open
+            if self.is_position_current(position, os.stat(abs_log_file)):
+                self.logger.debug(f"No new lines to process in {abs_log_file}")
+                return []
+            
             # Extract date from log file path - needed for timestamps
             log_date = self.extract_date_from_path(abs_log_file)
             
-            with open(abs_log_file, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
+            with open(abs_log_file, 'rb', buffering=1 << 20) as f:
+                file_stat = os.fstat(f.fileno())
+                file_size = file_stat.st_size
+                
+                # Starts over if the file was replaced by rotation or truncated
+                offset = self.get_resume_offset(position, file_stat)
                 
-                self.logger.debug(f"File contains {len(lines)} lines total")
+                self.logger.debug(f"Previously processed {offset} of {file_size} bytes")
                 
-                # If we've already processed all lines in this file, skip it
-                if processed_lines[abs_log_file] >= len(lines):
+                # If we've already processed everything in this file, skip it
+                if offset == file_size:
                     self.logger.debug(f"No new lines to process in {abs_log_file}")
+                    processed_lines[abs_log_file] = self.make_position(offset, file_stat)
                     return []
                 
-                # Skip already processed lines
-                for i in range(processed_lines[abs_log_file], len(lines)):
-                    line = lines[i]
-                    line_count = i + 1
-                    
-                    self.logger.debug(f"Processing line {i+1}: {line[:50]}...")
+                # Bind the per-line lookups to locals once instead of resolving them per line
+                beacon_regex_match = BEACON_CMD_RE.match
+                is_significant = self.is_significant_command
+                should_exclude = self.should_exclude_entry
+                make_timestamp = self.create_iso_timestamp
+                add_entry = new_entries.append
+                
+                # Map the file and scan only the new byte range for Beacon lines,
+                # so lines without commands are never copied or decoded
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Stop after the last complete line; a line still being written is
+                    # left for the next poll instead of being parsed half-finished
+                    end = file_size
+                    if mm[file_size - 1:file_size] != b'\n':
+                        end = max(offset, mm.rfind(b'\n', offset, file_size) + 1)
                     
-                    # Match only user commands to beacons
-                    cmd_match = self.beacon_cmd_regex.match(line)
-                    if cmd_match:
-                        self.logger.debug(f"  ✓ Line matched command pattern")
-                        time_str, beacon_id, username, hostname, command = cmd_match.groups()
-                        
-                        self.logger.debug(f"  Extracted: time={time_str}, beacon_id={beacon_id}, username={username}, hostname={hostname}")
-                        self.logger.debug(f"  Command: {command}")
+                    for line_match in BEACON_LINE_RE.finditer(mm, offset, end):
+                        if debug_on:
+                            self.logger.debug("Processing line: %.50s...",
+                                              line_match.group().decode('utf-8', errors='replace'))
                         
-                        # Create ISO timestamp from the log date and time string
-                        iso_timestamp = self.create_iso_timestamp(log_date, time_str)
+                        # Match only user commands to beacons
+                        fields = line_match.groups()
+                        if fields[0] is not None:
+                            fields = [field.decode('utf-8', errors='replace') for field in fields]
+                            fields[4] = fields[4].lstrip()
+                        else:
+                            line = line_match.group().decode('utf-8', errors='replace').rstrip('\r')
+                            fields = split_beacon_command(line)
+                            if fields is None and '):' in line:
+                                cmd_match = beacon_regex_match(line)
+                                if cmd_match:
+                                    fields = cmd_match.groups()
                         
-                        # Create the log entry with the timestamp
-                        # No longer splitting domain\user - keeping as username
-                        entry = {
-                            "timestamp": iso_timestamp,
-                            "hostname": hostname,
-                            "username": username,  # Keep domain\user together in username field
-                            "command": command,
-                            "notes": f"Beacon ID: {beacon_id}, Local time: {time_str}",
-                            "filename": "",
-                            "status": "",
-                            "internal_ip": "",
-                            "external_ip": ""
-                        }
-                        
-                        # Check if entry should be excluded or filtered
-                        if self.should_exclude_entry(entry):
-                            self.logger.debug(f"  ✗ Entry excluded: {command}")
-                            continue
+                        if fields:
+                            time_str, beacon_id, username, hostname, command = fields
+                            
+                            if debug_on:
+                                self.logger.debug("  ✓ Line matched command pattern")
+                                self.logger.debug("  Extracted: time=%s, beacon_id=%s, username=%s, hostname=%s",
+                                                  time_str, beacon_id, username, hostname)
+                                self.logger.debug("  Command: %s", command)
+                            
+                            # Drop insignificant commands before building anything for them
+                            if not is_significant(command):
+                                if debug_on:
+                                    self.logger.debug("  ✗ Command filtered as insignificant: %s", command)
+                                continue
+                            
+                            # Create ISO timestamp from the log date and time string
+                            iso_timestamp = make_timestamp(log_date, time_str)
                             
-                        if not self.is_significant_command(command):
-                            self.logger.debug(f"  ✗ Command filtered as insignificant: {command}")
-                            continue
+                            # Create the log entry with the timestamp
+                            # No longer splitting domain\user - keeping as username
+                            entry = {
+                                "timestamp": iso_timestamp,
+                                "hostname": hostname,
+                                "username": username,  # Keep domain\user together in username field
+                                "command": command,
+                                "notes": NOTES_TEMPLATE % (beacon_id, time_str),
+                                "filename": "",
+                                "status": "",
+                                "internal_ip": "",
+                                "external_ip": ""
+                            }
                             
-                        self.logger.debug(f"  Created entry: {entry}")
-                        new_entries.append(entry)
-                    else:
-                        self.logger.debug(f"  ✗ Line did not match command pattern")
+                            # Check if entry should be excluded
+                            if should_exclude(entry):
+                                if debug_on:
+                                    self.logger.debug("  ✗ Entry excluded: %s", command)
+                                continue
+                            
+                            if debug_on:
+                                self.logger.debug("  Created entry: %s", entry)
+                            add_entry(entry)
+                        elif debug_on:
+                            self.logger.debug("  ✗ Line did not match command pattern")
+                
+                # Remember where we stopped so the next poll only reads new bytes
+                offset = end
             
             self.logger.debug(f"Finished parsing file. Found {len(new_entries)} new command entries.")
             
-            # Update processed lines count with full absolute path
-            processed_lines[abs_log_file] = line_count
+            # Update processed position with full absolute path
+            processed_lines[abs_log_file] = self.make_position(offset, file_stat)
                 
             return new_entries
                 
         except Exception as e:
-            self.logger.error(f"Error parsing log file {abs_log_file}: {str(e)}")
-            self.logger.error(traceback.format_exc())
-            return []
-    
-    def extract_date_from_path(self, file_path):
-        """Extract the date from a log file path (e.g., logs/2025-03-31/beacon_123.log)"""
-        try:
-            # Try to find a date pattern in the path components
-            path_parts = file_path.split(os.sep)
-            for part in path_parts:
-                # Look for YYYY-MM-DD pattern
-                if re.match(r'^\d{4}-\d{2}-\d{2}$', part):
-                    return part
-            
-            # If no date found in path, use today's date
-            return datetime.now().strftime("%Y-%m-%d")
-        except Exception as e:
-            self.logger.error(f"Error extracting date from path {file_path}: {str(e)}")
-            return datetime.now().strftime("%Y-%m-%d")
-    
-    def create_iso_timestamp(self, date_str, time_str):
-        """
-        Create an ISO format timestamp from date string and time string
-        
-        Args:
-            date_str: String in format YYYY-MM-DD
-            time_str: String in format HH:MM:SS
-            
-        Returns:
-            String: ISO format timestamp (YYYY-MM-DDTHH:MM:SS)
-        """
-        try:
-            # Clean up time string (remove milliseconds if present)
-            clean_time = time_str.split('.')[0]
-            
-            # For short times like '00:01:23', ensure we have proper formatting
-            time_parts = clean_time.split(':')
-            if len(time_parts) == 3:
-                # Full time with hours, minutes, seconds
-                formatted_time = clean_time
-            elif len(time_parts) == 2:
-                # Missing seconds
-                formatted_time = f"{clean_time}:00"
-            else:
-                # Invalid format, use current time
-                formatted_time = datetime.now().strftime("%H:%M:%S")
-            
-            # Combine date and time
-            timestamp = f"{date_str}T{formatted_time}"
-            
-            # Validate by parsing
-            dt = datetime.fromisoformat(timestamp)
-            
-            # Return ISO format
-            return dt.isoformat()
-        except Exception as e:
-            # If there's any error, fallback to current time
-            self.logger.error(f"Error creating timestamp from {date_str} {time_str}: {str(e)}")
-            return datetime.now().isoformat()
\ No newline at end of file
+            self.logger.error("Error parsing log file %s: %s", abs_log_file, e, exc_info=True)
+            return []
\ No newline at end of file
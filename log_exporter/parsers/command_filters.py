@@ -81,7 +81,4 @@ def get_insignificant_commands(framework_type):
         all_commands.extend(FRAMEWORK_COMMANDS[framework_type])
         
     # Remove duplicates while preserving order
-    seen = set()
-    unique_commands = [x for x in all_commands if not (x in seen or seen.add(x))]
-    
-    return unique_commands
\ No newline at end of file
+    return list(dict.fromkeys(all_commands))
\ No newline at end of file
@@ -1,12 +1,92 @@
 import os
 import re
+import sys
+import stat
 import json
+import mmap
 import logging
-import traceback
-from datetime import datetime, timedelta
+from functools import partial
+from datetime import date, timedelta
 
 from parsers.base_parser import BaseLogParser
 
+# Use orjson for JSON log lines when it's installed, it decodes much faster than
+# the stdlib. Both raise a ValueError subclass on invalid input.
+try:
+    from orjson import loads as loads_json
+except ImportError:
+    loads_json = json.loads
+
+# Lowercased file name parts of logs that never hold commands
+SKIP_FILE_NAME_PARTS = ('debug', 'error', 'system', 'startup', 'shutdown', 'heartbeat')
+
+# Lowercased file name parts of logs that usually do
+PRIORITY_FILE_NAME_PARTS = ('session', 'client', 'operator', 'console', 'sliver-server')
+
+# Text near the start of a file that suggests command activity
+COMMAND_INDICATORS = (
+    'Executing command:', 'shell ', ' ls ', ' cd ', ' ps ',
+    'download ', 'upload ', 'execute ', '[client]', '[console]',
+    'screenshot', 'session established', 'session '
+)
+
+# Session and operator subdirectories are named after their (UUID-style) IDs,
+# 8 to 36 characters of lowercase hex and dashes
+SESSION_DIR_CHARS = frozenset('0123456789abcdef-')
+
+# Explicit "User: X" field
+USER_FIELD_RE = re.compile(r'User:\s+([^\s,;]+)')
+
+# NT AUTHORITY\SYSTEM style usernames
+NT_AUTHORITY_RE = re.compile(r'(NT AUTHORITY\\[A-Z]+)')
+
+# Starting file downloads/uploads in session logs
+FILE_OPERATION_RE = re.compile(r'Starting file ((?:download|upload)): (.+?)(?:\s|$)')
+
+# Hostname and IP in "New session established from HOST (IP)"
+NEW_SESSION_RE = re.compile(r'New session established from ([^\s(]+)\s+\(([^)]+)\)')
+
+# Session fields a "New session established" line sets. Those values overwrite whatever
+# was there; every other metadata value only fills a field that is still empty.
+AUTHORITATIVE_FIELDS = ('hostname', 'ip')
+
+# File argument of a client download/upload command
+CLIENT_FILE_RE = re.compile(r'(?:download|upload)\s+([^\s;|><]+)')
+
+# Commands in lines that don't match a more specific format, with the prefix
+# each one is reported under
+GENERIC_CMD_PATTERNS = [
+    ('shell', re.compile(r'shell\s+(.+?)$')),  # shell commands
+    ('execute', re.compile(r'execute\s+(.+?)$')),  # execute commands
+    ('run', re.compile(r'run\s+(.+?)$')),  # run commands
+    ('download', re.compile(r'download\s+(.+?)(?:\s|$)')),  # download commands
+    ('upload', re.compile(r'upload\s+(.+?)(?:\s|$)'))  # upload commands
+]
+
+# Session metadata patterns, tried in order until one matches. Each is paired
+# with a literal it can't match without, so most lines skip the regex entirely
+HOSTNAME_PATTERNS = [
+    ('from', re.compile(r'from\s+([A-Za-z0-9_-]+)\s+\(')),  # hostname in "from HOST (IP)"
+    ('hostname', re.compile(r'hostname\s+([^\s,;]+)')),  # explicit hostname field
+    ('registered with hostname', re.compile(r'registered with hostname\s+([^\s,;]+)'))  # registration message
+]
+IP_PATTERNS = [
+    ('from', re.compile(r'from\s+.*?\((\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\)')),  # IP in "from HOST (IP)"
+    ('.', re.compile(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'))  # any IP in the line
+]
+USERNAME_PATTERNS = [
+    ('User:', USER_FIELD_RE),  # explicit User field
+    ('user', re.compile(r'user(?:name)?[\s:]+([^\s,;]+)')),  # username field
+    ('as user', re.compile(r'as user\s+([^\s,;]+)'))  # "as user X" format
+]
+
+def line_time(line):
+    """Return the time string from a line's leading "[time]", or "" if it has none"""
+    if not line.startswith('['):
+        return ""
+    end = line.find(']', 1)
+    return line[1:end] if end != -1 else ""
+
 class SliverParser(BaseLogParser):
     """
     Parser for Sliver C2 logs
@@ -15,6 +95,12 @@ class SliverParser(BaseLogParser):
     filtering out noise and system messages to reduce verbosity.
     """
     
+    # processed_lines holds byte offsets (with the file's inode) for this parser
+    tracks_byte_offsets = True
+    
+    # Files can go to worker processes; session_metadata is passed back and forth as shared state
+    supports_process_pool = True
+    
     def __init__(self, root_dir, historical_days=1, max_tracked_days=2, filter_mode="all"):
         super().__init__(root_dir, historical_days, max_tracked_days, filter_mode)
         
@@ -24,6 +110,9 @@ class SliverParser(BaseLogParser):
         # Define a mapping of session IDs to hostnames/IPs for context enrichment
         self.session_metadata = {}  # Format: {session_id: {'hostname': X, 'ip': Y, 'username': Z}}
         
+        # Sessions whose AUTHORITATIVE_FIELDS came from a "New session established" line
+        self.confirmed_sessions = set()
+        
         # Regex for UUID-style session IDs
         self.session_id_regex = re.compile(r'([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})')
         
@@ -39,7 +128,9 @@ class SliverParser(BaseLogParser):
         
         # Pattern to identify commands that are just output or status messages
         # Updated to include more types of output messages
-        self.command_output_regex = re.compile(r'(?:File listing:|Command (?:completed|output)|Downloaded|Screenshot saved|Welcome to|NT AUTHORITY|uid=|Session (?:terminated|backgrounded)|Interactive mode|Taking screenshot|use\s+[a-f0-9-]+|download complete|File download complete)')
+        # ("download complete" also covers "File download complete")
+        # parse_log_file runs this once per text line, before any of the line parsers
+        self.command_output_regex = re.compile(r'(?:File listing:|Command (?:completed|output)|Downloaded|Screenshot saved|Welcome to|NT AUTHORITY|uid=|Session (?:terminated|backgrounded)|Interactive mode|Taking screenshot|use\s+[a-f0-9-]+|download complete)')
         
         # We now use the command_filters.py module for exclusions
         
@@ -61,8 +152,11 @@ class SliverParser(BaseLogParser):
         """Get all log directories to monitor, including historical ones if specified"""
         log_dirs = []
         
-        # Verify the base logs directory exists
-        if not os.path.exists(self.sliver_logs_base_dir):
+        # Read the base logs directory once; everything below is checked against this listing
+        try:
+            with os.scandir(self.sliver_logs_base_dir) as entries:
+                base_subdirs = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
             self.logger.error(f"Logs base directory does not exist: {self.sliver_logs_base_dir}")
             self.logger.error(f"Make sure you're running this script from the Sliver root directory.")
             return []
@@ -73,81 +167,70 @@ class SliverParser(BaseLogParser):
         # - Some might be in date-based directories like YYYY-MM-DD
         
         # Start by checking if there are any date-based directories
-        today = datetime.now().date()
-        has_date_dirs = False
+        today = date.today()
         
         # Check if today's directory exists (to detect date-based structure)
-        today_str = today.strftime("%Y-%m-%d")
-        today_dir = os.path.join(self.sliver_logs_base_dir, today_str)
-        if os.path.exists(today_dir) and os.path.isdir(today_dir):
-            log_dirs.append(today_dir)
-            has_date_dirs = True
+        today_str = today.isoformat()
+        if today_str in base_subdirs:
+            log_dirs.append(os.path.join(self.sliver_logs_base_dir, today_str))
             
             # If we have date-based directories, add historical ones too
-            yesterday = today - timedelta(days=1)
-            yesterday_str = yesterday.strftime("%Y-%m-%d")
-            yesterday_dir = os.path.join(self.sliver_logs_base_dir, yesterday_str)
-            if os.path.exists(yesterday_dir):
-                log_dirs.append(yesterday_dir)
-            
-            # Add more historical directories if requested
+            days_back = 1
             if self.historical_days > 1:
-                additional_days = min(self.historical_days - 1, self.max_tracked_days - 1)
-                if additional_days > 0:
-                    for i in range(2, additional_days + 2):  # Start from 2 days ago
-                        past_date = today - timedelta(days=i)
-                        past_dir = os.path.join(self.sliver_logs_base_dir, past_date.strftime("%Y-%m-%d"))
-                        if os.path.exists(past_dir):
-                            log_dirs.append(past_dir)
+                days_back += max(0, min(self.historical_days - 1, self.max_tracked_days - 1))
+            for i in range(1, days_back + 1):
+                past_str = (today - timedelta(days=i)).isoformat()
+                if past_str in base_subdirs:
+                    log_dirs.append(os.path.join(self.sliver_logs_base_dir, past_str))
         
         # Always add the base directory itself
-        if self.sliver_logs_base_dir not in log_dirs:
-            log_dirs.append(self.sliver_logs_base_dir)
+        log_dirs.append(self.sliver_logs_base_dir)
         
         # Check for common subdirectories
         for subdir in ["sessions", "operators", "clients", "beacons", "implants"]:
+            if subdir not in base_subdirs:
+                continue
             dir_path = os.path.join(self.sliver_logs_base_dir, subdir)
-            if os.path.exists(dir_path) and os.path.isdir(dir_path):
-                if dir_path not in log_dirs:
-                    log_dirs.append(dir_path)
-                
-                # Also add any UUID-named subdirectories (session/operator IDs)
-                for item in os.listdir(dir_path):
-                    item_path = os.path.join(dir_path, item)
-                    if os.path.isdir(item_path) and re.match(r'^[a-f0-9-]{8,36}$', item):
-                        if item_path not in log_dirs:
-                            log_dirs.append(item_path)
+            log_dirs.append(dir_path)
+            
+            # Also add any UUID-named subdirectories (session/operator IDs)
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if 8 <= len(entry.name) <= 36 and SESSION_DIR_CHARS.issuperset(entry.name) and entry.is_dir():
+                        log_dirs.append(entry.path)
             
         # Log all directories found
-        existing_dirs = [d for d in log_dirs if os.path.exists(d)]
-        self.logger.info(f"Found {len(existing_dirs)} log directories to monitor:")
-        for d in existing_dirs:
+        self.logger.info(f"Found {len(log_dirs)} log directories to monitor:")
+        for d in log_dirs:
             self.logger.info(f"  - {d}")
             
-        return existing_dirs
+        return log_dirs
     
     def is_valid_log_file(self, file_path):
         """Check if a file is a valid Sliver log file"""
-        if not os.path.exists(file_path) or os.path.isdir(file_path):
-            return False
-            
         # Sliver logs typically have .log or .json extensions
         file_name = os.path.basename(file_path)
         if not (file_name.endswith('.log') or file_name.endswith('.json')):
             return False
         
         # Skip files that are clearly not command logs
-        skip_patterns = ['debug', 'error', 'system', 'startup', 'shutdown', 'heartbeat']
-        if any(pattern in file_name.lower() for pattern in skip_patterns):
+        lower_name = file_name.lower()
+        if any(pattern in lower_name for pattern in SKIP_FILE_NAME_PARTS):
+            return False
+        
+        # Must exist and not be a directory; one stat checks both
+        try:
+            if stat.S_ISDIR(os.stat(file_path).st_mode):
+                return False
+        except OSError:
             return False
             
         # Check if filename contains a session ID
-        if re.search(self.session_id_regex, file_name):
+        if self.session_id_regex.search(file_name):
             return True
             
         # Check for common log names that might contain commands
-        priority_logs = ['session', 'client', 'operator', 'console', 'sliver-server']
-        if any(name in file_name.lower() for name in priority_logs):
+        if any(name in lower_name for name in PRIORITY_FILE_NAME_PARTS):
             return True
             
         # If none of the above match, perform a quick content check of the first few lines
@@ -157,108 +240,55 @@ class SliverParser(BaseLogParser):
                 sample_content = ''.join([f.readline() for _ in range(5)])
                 
                 # Check if content suggests command activity
-                command_indicators = [
-                    'Executing command:', 'shell ', ' ls ', ' cd ', ' ps ', 
-                    'download ', 'upload ', 'execute ', '[client]', '[console]',
-                    'screenshot', 'session established', 'session '
-                ]
-                
-                if any(indicator in sample_content for indicator in command_indicators):
+                if any(indicator in sample_content for indicator in COMMAND_INDICATORS):
                     return True
         except Exception as e:
             self.logger.debug(f"Error checking file content for {file_path}: {str(e)}")
             
         return False
     
-    def extract_date_from_path(self, file_path):
-        """Extract the date from a log file path"""
-        try:
-            # Try to find a date pattern in the path components
-            path_parts = file_path.split(os.sep)
-            for part in path_parts:
-                # Look for YYYY-MM-DD pattern
-                if re.match(r'^\d{4}-\d{2}-\d{2}$', part):
-                    return part
-            
-            # If no date found in path, use today's date
-            return datetime.now().strftime("%Y-%m-%d")
-        except Exception as e:
-            self.logger.error(f"Error extracting date from path {file_path}: {str(e)}")
-            return datetime.now().strftime("%Y-%m-%d")
-    
-    def create_iso_timestamp(self, date_str, time_str):
-        """
-        Create an ISO format timestamp from date string and time string
-        
-        Args:
-            date_str: String in format YYYY-MM-DD
-            time_str: String in format HH:MM:SS
-            
-        Returns:
-            String: ISO format timestamp (YYYY-MM-DDTHH:MM:SS)
-        """
-        try:
-            # Clean up time string (remove milliseconds if present)
-            clean_time = time_str.split('.')[0]
-            
-            # For short times like '00:01:23', ensure we have proper formatting
-            time_parts = clean_time.split(':')
-            if len(time_parts) == 3:
-                # Full time with hours, minutes, seconds
-                formatted_time = clean_time
-            elif len(time_parts) == 2:
-                # Missing seconds
-                formatted_time = f"{clean_time}:00"
-            else:
-                # Invalid format, use current time
-                formatted_time = datetime.now().strftime("%H:%M:%S")
-            
-            # Combine date and time
-            timestamp = f"{date_str}T{formatted_time}"
-            
-            # Validate by parsing
-            dt = datetime.fromisoformat(timestamp)
-            
-            # Return ISO format
-            return dt.isoformat()
-        except Exception as e:
-            # If there's any error, fallback to current time
-            self.logger.error(f"Error creating timestamp from {date_str} {time_str}: {str(e)}")
-            return datetime.now().isoformat()
-    
     def parse_log_file(self, log_file, processed_lines):
         """Parse a Sliver log file and extract only command entries"""
         # Convert to absolute path for consistency
         abs_log_file = os.path.abspath(log_file)
         
-        # Get previously processed lines count
-        if abs_log_file not in processed_lines:
-            processed_lines[abs_log_file] = 0
-        
-        line_count = 0
+        # Previously processed position (byte offset plus the file's inode, size and mtime)
+        position = processed_lines.get(abs_log_file)
         new_entries = []
         
+        # Per-line debug output is only formatted when debug logging is on
+        debug_on = self.logger.isEnabledFor(logging.DEBUG)
+        
         self.logger.debug(f"Starting to parse file: {abs_log_file}")
-        self.logger.debug(f"Previously processed {processed_lines.get(abs_log_file, 0)} lines")
         
         try:
+            # A file that hasn't changed since it was fully read costs one stat, not an open
+            if self.is_position_current(position, os.stat(abs_log_file)):
+                self.logger.debug(f"No new lines to process in {abs_log_file}")
+                return []
+            
             # Extract date from log file path - needed for timestamps
             log_date = self.extract_date_from_path(abs_log_file)
             
-            with open(abs_log_file, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
+            with open(abs_log_file, 'rb') as f:
+                file_stat = os.fstat(f.fileno())
+                
+                # Starts over if the file was replaced by rotation or truncated
+                offset = self.get_resume_offset(position, file_stat)
                 
-                self.logger.debug(f"File contains {len(lines)} lines total")
+                self.logger.debug(f"Previously processed {offset} of {file_stat.st_size} bytes")
                 
-                # If we've already processed all lines in this file, skip it
-                if processed_lines[abs_log_file] >= len(lines):
+                # If we've already processed everything in this file, skip it
+                if offset == file_stat.st_size:
                     self.logger.debug(f"No new lines to process in {abs_log_file}")
+                    processed_lines[abs_log_file] = self.make_position(offset, file_stat)
                     return []
                 
                 # Determine log type - this helps with parsing strategy
                 file_name = os.path.basename(abs_log_file)
-                is_session_log = 'session' in file_name.lower() or re.search(self.session_id_regex, file_name)
-                is_client_log = any(name in file_name.lower() for name in ['client', 'operator', 'console'])
+                lower_name = file_name.lower()
+                is_session_log = 'session' in lower_name or self.session_id_regex.search(file_name)
+                is_client_log = 'client' in lower_name or 'operator' in lower_name or 'console' in lower_name
                 is_json_log = file_name.endswith('.json') or file_name.endswith('.json.log')
                 
                 # Try to find session ID from filename
@@ -267,67 +297,97 @@ class SliverParser(BaseLogParser):
                 if session_match:
                     session_id = session_match.group(1)
                 
-                # Skip already processed lines
-                for i in range(processed_lines[abs_log_file], len(lines)):
-                    line = lines[i].strip()
-                    line_count = i + 1
-                    
-                    if not line:  # Skip empty lines
-                        continue
+                # Bind the per-line lookups to locals once instead of resolving them per line
+                extract_metadata = self.extract_session_metadata
+                make_timestamp = self.create_iso_timestamp
+                parse_json = self.parse_json_entry
+                parse_session = self.parse_session_line
+                parse_client = self.parse_client_line
+                parse_generic = self.parse_generic_line
+                should_exclude = self.should_exclude_entry
+                is_significant = self.is_significant_command
+                is_output_line = self.command_output_regex.search
+                add_entry = new_entries.append
+                
+                # Pick the line parsers for this kind of log once. Each text line goes
+                # through them in order until one returns an entry that isn't excluded,
+                # with the generic parser as the last resort for every kind of log.
+                line_parsers = []
+                if is_session_log:
+                    line_parsers.append(partial(parse_session, default_session_id=session_id))
+                if is_client_log:
+                    line_parsers.append(parse_client)
+                line_parsers.append(parse_generic)
+                
+                # The new bytes are read front to back once, so ask for more readahead
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), offset, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                # Map the file and walk the new byte range line by line, decoding
+                # each line straight from the mapping without buffered reads
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    file_size = min(file_stat.st_size, len(mm))
+                    find_newline = mm.find
+                    while offset < file_size:
+                        # A line without its newline is still being written, leave it for the next poll
+                        newline = find_newline(b'\n', offset, file_size)
+                        if newline == -1:
+                            break
+                        line = mm[offset:newline].decode('utf-8', errors='replace').strip()
+                        offset = newline + 1
                         
-                    self.logger.debug(f"Processing line {i+1}: {line[:100]}...")
-                    
-                    # Extract session metadata for context enrichment
-                    self.extract_session_metadata(line)
-                    
-                    # Extract timestamp from line if present
-                    timestamp_match = re.match(r'\[(.*?)\]', line)
-                    time_str = timestamp_match.group(1) if timestamp_match else ""
-                    
-                    # Create ISO timestamp
-                    iso_timestamp = self.create_iso_timestamp(log_date, time_str)
-                    
-                    # Parse JSON logs
-                    if is_json_log or line.startswith('{'):
-                        try:
-                            log_entry = json.loads(line)
-                            entry = self.parse_json_entry(log_entry, iso_timestamp)
-                            if entry and not self.should_exclude_entry(entry):
-                                # Check if this command is significant based on the filter mode
-                                if self.is_significant_command(entry["command"]):
-                                    new_entries.append(entry)
-                                continue
-                        except json.JSONDecodeError:
-                            # Not JSON or invalid JSON, will process as text
-                            pass
-                    
-                    # Parse session logs
-                    if is_session_log:
-                        entry = self.parse_session_line(line, session_id, iso_timestamp)
-                        if entry and not self.should_exclude_entry(entry):
-                            # Check if this command is significant based on the filter mode
-                            if self.is_significant_command(entry["command"]):
-                                new_entries.append(entry)
+                        if not line:  # Skip empty lines
                             continue
-                    
-                    # Parse client/console logs
-                    if is_client_log:
-                        entry = self.parse_client_line(line, iso_timestamp)
-                        if entry and not self.should_exclude_entry(entry):
-                            # Check if this command is significant based on the filter mode
-                            if self.is_significant_command(entry["command"]):
-                                new_entries.append(entry)
+                            
+                        if debug_on:
+                            self.logger.debug("Processing line: %.100s...", line)
+                        
+                        # Extract session metadata for context enrichment
+                        extract_metadata(line)
+                        
+                        # Extract timestamp from line if present
+                        time_str = line_time(line)
+                        
+                        # Create ISO timestamp
+                        iso_timestamp = make_timestamp(log_date, time_str)
+                        
+                        # Parse JSON logs
+                        if is_json_log or line.startswith('{'):
+                            try:
+                                log_entry = loads_json(line)
+                            except ValueError:
+                                # Not JSON or invalid JSON, will process as text
+                                log_entry = None
+                            if log_entry is not None:
+                                entry = parse_json(log_entry, iso_timestamp)
+                                if entry and not should_exclude(entry):
+                                    # Check if this command is significant based on the filter mode
+                                    if is_significant(entry["command"]):
+                                        add_entry(entry)
+                                    continue
+                        
+                        # Skip lines with output/status messages; checked once here rather
+                        # than again in each line parser the line falls through to
+                        if is_output_line(line):
                             continue
-                    
-                    # Generic parsing for any other lines that might contain commands
-                    entry = self.parse_generic_line(line, iso_timestamp)
-                    if entry and not self.should_exclude_entry(entry):
-                        # Check if this command is significant based on the filter mode
-                        if self.is_significant_command(entry["command"]):
-                            new_entries.append(entry)
+                        
+                        # Parse session, client/console and generic command lines
+                        for parse_line in line_parsers:
+                            entry = parse_line(line, default_timestamp=iso_timestamp)
+                            if entry and not should_exclude(entry):
+                                # Check if this command is significant based on the filter mode
+                                if is_significant(entry["command"]):
+                                    add_entry(entry)
+                                break
+                
+                # Everything before the offset is never read again, so let the kernel
+                # drop those pages instead of evicting other files' cache to keep them.
+                # A length of 0 would mean "to the end of the file", so skip it then.
+                if offset > 0 and hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, offset, os.POSIX_FADV_DONTNEED)
             
-            # Update processed lines count
-            processed_lines[abs_log_file] = line_count
+            # Update processed position with full absolute path
+            processed_lines[abs_log_file] = self.make_position(offset, file_stat)
             
             # Log the results
             if new_entries:
@@ -338,10 +398,45 @@ class SliverParser(BaseLogParser):
             return new_entries
                 
         except Exception as e:
-            self.logger.error(f"Error parsing log file {abs_log_file}: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.logger.error("Error parsing log file %s: %s", abs_log_file, e, exc_info=True)
             return []
     
+    def get_shared_state(self):
+        """
+        Session metadata learned so far, so worker processes can enrich commands with it
+        
+        Returns:
+            dict: {session_id: {field: (value, authoritative)}}
+        """
+        confirmed = self.confirmed_sessions
+        return {session_id: {field: (value, session_id in confirmed and field in AUTHORITATIVE_FIELDS)
+                             for field, value in metadata.items()}
+                for session_id, metadata in self.session_metadata.items()}
+    
+    def get_shared_state_changes(self, previous_state):
+        """Session metadata fields that were set or confirmed since previous_state was taken"""
+        changes = {}
+        for session_id, fields in self.get_shared_state().items():
+            previous = previous_state.get(session_id, {})
+            changed = {field: tagged for field, tagged in fields.items() if previous.get(field) != tagged}
+            if changed:
+                changes[session_id] = changed
+        return changes
+    
+    def merge_shared_state(self, state):
+        """
+        Merge session metadata from another process with the same precedence as parsing:
+        authoritative values overwrite, the rest only fill fields that are still empty
+        """
+        for session_id, fields in state.items():
+            merged = self.session_metadata.setdefault(session_id, {})
+            for field, (value, authoritative) in fields.items():
+                if authoritative:
+                    merged[field] = sys.intern(value)
+                    self.confirmed_sessions.add(session_id)
+                elif not merged.get(field):
+                    merged[field] = sys.intern(value)
+    
     # We now use the base class implementation of should_exclude_entry
     # which leverages the centralized command_filters.py module
     
@@ -395,20 +490,13 @@ class SliverParser(BaseLogParser):
         return None
     
     def parse_session_line(self, line, default_session_id=None, default_timestamp=None):
-        """Parse a line from a session log"""
-        # Extract timestamp if present
-        timestamp_match = re.match(r'\[(.*?)\]', line)
-        timestamp = timestamp_match.group(1) if timestamp_match else ""
-        
-        # Skip lines with output/status messages
-        if self.command_output_regex.search(line):
-            return None
-        
+        """Parse a line from a session log (output/status lines are skipped by parse_log_file)"""
         # Pattern for "Executing command: X" in session logs
-        cmd_match = self.executing_cmd_regex.search(line)
+        # (the substring checks skip the regex on lines that can't match it)
+        cmd_match = "Executing command: " in line and self.executing_cmd_regex.search(line)
         if cmd_match:
             command = cmd_match.group(1).strip()
-            entry = self.create_basic_entry(command, default_timestamp or timestamp)
+            entry = self.create_basic_entry(command, default_timestamp or line_time(line))
             
             # Try to find session ID in line if not provided
             session_id = default_session_id
@@ -423,20 +511,20 @@ class SliverParser(BaseLogParser):
                 self.add_session_context(entry, session_id)
             
             # Extract username from the line if present
-            username_match = re.search(r'User:\s+([^\s,;]+)', line)
+            username_match = "User:" in line and USER_FIELD_RE.search(line)
             if username_match and not entry["username"]:
                 entry["username"] = username_match.group(1)
             
             return entry
         
         # Check for file operations (only starting downloads/uploads, not completions)
-        file_match = re.search(r'Starting file ((?:download|upload)): (.+?)(?:\s|$)', line)
+        file_match = "Starting file " in line and FILE_OPERATION_RE.search(line)
         if file_match:
             operation = file_match.group(1)
             filepath = file_match.group(2)
             command = f"Starting file {operation}: {filepath}"
             
-            entry = self.create_basic_entry(command, default_timestamp or timestamp)
+            entry = self.create_basic_entry(command, default_timestamp or line_time(line))
             
             # Set filename
             entry["filename"] = os.path.basename(filepath)
@@ -451,7 +539,7 @@ class SliverParser(BaseLogParser):
         # Check for "New session established" to get session metadata
         if "New session established from" in line:
             # Extract hostname and IP
-            match = re.search(r'New session established from ([^\s(]+)\s+\(([^)]+)\)', line)
+            match = NEW_SESSION_RE.search(line)
             if match:
                 hostname = match.group(1)
                 ip = match.group(2)
@@ -465,35 +553,26 @@ class SliverParser(BaseLogParser):
                 
                 if session_id:
                     # Update session metadata
-                    if session_id not in self.session_metadata:
-                        self.session_metadata[session_id] = {}
-                    
-                    self.session_metadata[session_id]["hostname"] = hostname
-                    self.session_metadata[session_id]["ip"] = ip
+                    metadata = self.session_metadata.setdefault(session_id, {})
+                    metadata["hostname"] = sys.intern(hostname)
+                    metadata["ip"] = sys.intern(ip)
+                    self.confirmed_sessions.add(session_id)
         
         return None
     
     def parse_client_line(self, line, default_timestamp=None):
-        """Parse a line from a client or console log"""
-        # Extract timestamp if present
-        timestamp_match = re.match(r'\[(.*?)\]', line)
-        timestamp = timestamp_match.group(1) if timestamp_match else ""
-        
-        # Skip lines with output/status messages
-        if self.command_output_regex.search(line):
-            return None
-        
+        """Parse a line from a client or console log (output/status lines are skipped by parse_log_file)"""
         # Check for client/console commands
-        client_match = self.client_cmd_regex.search(line)
+        client_match = ("[client] " in line or "[console] " in line) and self.client_cmd_regex.search(line)
         if client_match:
             component = client_match.group(1)  # "client" or "console"
             command = client_match.group(2).strip()
             
-            entry = self.create_basic_entry(command, default_timestamp or timestamp)
+            entry = self.create_basic_entry(command, default_timestamp or line_time(line))
             
             # Extract filename for file operations
             if any(op in command for op in ['download', 'upload']):
-                file_match = re.search(r'(?:download|upload)\s+([^\s;|><]+)', command)
+                file_match = CLIENT_FILE_RE.search(command)
                 if file_match:
                     entry["filename"] = os.path.basename(file_match.group(1))
             
@@ -502,30 +581,18 @@ class SliverParser(BaseLogParser):
         return None
     
     def parse_generic_line(self, line, default_timestamp=None):
-        """Fallback parser for any other line that might contain commands"""
-        # Skip lines with output/status messages
-        if self.command_output_regex.search(line):
-            return None
-            
+        """Fallback parser for any other line that might contain commands (output/status lines are skipped by parse_log_file)"""
         # Try to find commands in any other format
-        for cmd_pattern in [
-            r'shell\s+(.+?),  # shell commands
-            r'execute\s+(.+?),  # execute commands
-            r'run\s+(.+?),  # run commands
-            r'download\s+(.+?)(?:\s|$)',  # download commands
-            r'upload\s+(.+?)(?:\s|$)'  # upload commands
-        ]:
-            match = re.search(cmd_pattern, line)
+        for prefix, cmd_pattern in GENERIC_CMD_PATTERNS:
+            # Every pattern starts with its prefix, so skip it unless the prefix appears
+            if prefix not in line:
+                continue
+            match = cmd_pattern.search(line)
             if match:
-                # Extract timestamp if present
-                timestamp_match = re.match(r'\[(.*?)\]', line)
-                timestamp = timestamp_match.group(1) if timestamp_match else ""
-                
                 # Create command with the proper prefix
-                prefix = cmd_pattern.split('\\')[0]
                 command = f"{prefix} {match.group(1).strip()}"
                 
-                entry = self.create_basic_entry(command, default_timestamp or timestamp)
+                entry = self.create_basic_entry(command, default_timestamp or line_time(line))
                 
                 # Look for session ID in the line
                 session_match = self.session_id_regex.search(line)
@@ -581,62 +648,43 @@ class SliverParser(BaseLogParser):
                 
             session_id = session_match.group(1)
             
-            # Initialize if this is a new session
-            if session_id not in self.session_metadata:
-                self.session_metadata[session_id] = {}
+            # Initialize if this is a new session. Parse threads share this parser, so
+            # setdefault makes sure they all end up writing into the same dict.
+            metadata = self.session_metadata.setdefault(session_id, {})
             
-            # Extract hostname
-            hostname_patterns = [
-                r'from\s+([A-Za-z0-9_-]+)\s+\(',  # hostname in "from HOST (IP)"
-                r'hostname\s+([^\s,;]+)',  # explicit hostname field
-                r'registered with hostname\s+([^\s,;]+)'  # registration message
-            ]
+            # Fields are never overwritten once set, so their patterns only run
+            # while they're still empty. Values are interned because the same
+            # hosts and users show up across many sessions.
             
-            for pattern in hostname_patterns:
-                hostname_match = re.search(pattern, line)
-                if hostname_match:
-                    hostname = hostname_match.group(1)
-                    # Don't overwrite existing hostname unless empty
-                    if "hostname" not in self.session_metadata[session_id] or not self.session_metadata[session_id].get("hostname"):
-                        self.session_metadata[session_id]["hostname"] = hostname
-                    break
+            # Extract hostname
+            if not metadata.get("hostname"):
+                for literal, pattern in HOSTNAME_PATTERNS:
+                    hostname_match = literal in line and pattern.search(line)
+                    if hostname_match:
+                        metadata["hostname"] = sys.intern(hostname_match.group(1))
+                        break
             
             # Extract IP address
-            ip_patterns = [
-                r'from\s+.*?\((\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\)',  # IP in "from HOST (IP)"
-                r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # any IP in the line
-            ]
-            
-            for pattern in ip_patterns:
-                ip_match = re.search(pattern, line)
-                if ip_match:
-                    ip = ip_match.group(1)
-                    # Don't overwrite existing IP unless empty
-                    if "ip" not in self.session_metadata[session_id] or not self.session_metadata[session_id].get("ip"):
-                        self.session_metadata[session_id]["ip"] = ip
-                    break
+            if not metadata.get("ip"):
+                for literal, pattern in IP_PATTERNS:
+                    ip_match = literal in line and pattern.search(line)
+                    if ip_match:
+                        metadata["ip"] = sys.intern(ip_match.group(1))
+                        break
             
             # Extract username
-            username_patterns = [
-                r'User:\s+([^\s,;]+)',  # explicit User field
-                r'user(?:name)?[\s:]+([^\s,;]+)',  # username field
-                r'as user\s+([^\s,;]+)'  # "as user X" format
-            ]
-            
-            for pattern in username_patterns:
-                username_match = re.search(pattern, line)
-                if username_match:
-                    username = username_match.group(1)
-                    # Don't overwrite existing username unless empty
-                    if "username" not in self.session_metadata[session_id] or not self.session_metadata[session_id].get("username"):
-                        self.session_metadata[session_id]["username"] = username
-                    break
+            if not metadata.get("username"):
+                for literal, pattern in USERNAME_PATTERNS:
+                    username_match = literal in line and pattern.search(line)
+                    if username_match:
+                        metadata["username"] = sys.intern(username_match.group(1))
+                        break
             
             # Special case for NT AUTHORITY\SYSTEM format
-            if "NT AUTHORITY" in line and ("username" not in self.session_metadata[session_id] or not self.session_metadata[session_id].get("username")):
-                nt_match = re.search(r'(NT AUTHORITY\\[A-Z]+)', line)
+            if "NT AUTHORITY" in line and not metadata.get("username"):
+                nt_match = NT_AUTHORITY_RE.search(line)
                 if nt_match:
-                    self.session_metadata[session_id]["username"] = nt_match.group(1)
+                    metadata["username"] = sys.intern(nt_match.group(1))
                 
         except Exception as e:
             self.logger.debug(f"Error extracting session metadata: {str(e)}")
\ No newline at end of file
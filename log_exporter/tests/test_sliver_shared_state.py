@@ -0,0 +1,68 @@
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+from datetime import date
+
+# The log exporter imports its packages relative to its own directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.forwarder as forwarder
+from parsers.sliver import SliverParser
+
+SESSION_ID = "0123abcd-0123-4567-89ab-0123456789ab"
+
+class SliverSharedStateTest(unittest.TestCase):
+    """Session metadata merged from parse worker processes follows the parser's precedence"""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.root_dir = tempfile.mkdtemp()
+        log_dir = os.path.join(self.root_dir, "logs", date.today().isoformat())
+        os.makedirs(log_dir)
+
+        # A client log that mentions the session with a heuristic hostname, and the
+        # session log whose "New session established" line names the real host
+        self.client_log = os.path.join(log_dir, "client.log")
+        with open(self.client_log, "w") as f:
+            f.write(f"2024-01-01 10:00:00 [client] {SESSION_ID} hostname decoy0 ready\n")
+        self.session_log = os.path.join(log_dir, f"session_{SESSION_ID}.log")
+        with open(self.session_log, "w") as f:
+            f.write("2024-01-01 10:00:00 New session established from REAL (10.1.1.1)\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+        logging.disable(logging.NOTSET)
+
+    def parse_in_separate_workers(self, log_files, main_parser):
+        """Parse each file as its own worker process would, then merge in the given order"""
+        shared_state = main_parser.get_shared_state()
+        results = []
+        for log_file in log_files:
+            forwarder.worker_parser = SliverParser(self.root_dir)
+            results.append(forwarder.parse_in_worker(log_file, None, shared_state))
+        for _, _, _, worker_state in results:
+            main_parser.merge_shared_state(worker_state)
+
+    def test_new_session_hostname_wins_in_either_order(self):
+        for log_files in ([self.session_log, self.client_log], [self.client_log, self.session_log]):
+            main_parser = SliverParser(self.root_dir)
+            self.parse_in_separate_workers(log_files, main_parser)
+            self.assertEqual(main_parser.session_metadata[SESSION_ID],
+                             {"hostname": "REAL", "ip": "10.1.1.1"})
+
+    def test_later_batch_keeps_new_session_hostname(self):
+        main_parser = SliverParser(self.root_dir)
+        self.parse_in_separate_workers([self.session_log, self.client_log], main_parser)
+
+        # A worker still holding the heuristic value from an earlier job only reports
+        # what it changes, so it can't undo the confirmed hostname
+        with open(self.client_log, "a") as f:
+            f.write(f"2024-01-01 10:01:00 [client] {SESSION_ID} hostname decoy1 ready\n")
+        self.parse_in_separate_workers([self.client_log], main_parser)
+        self.assertEqual(main_parser.session_metadata[SESSION_ID]["hostname"], "REAL")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,86 +8,178 @@ but is modified to work within a container environment.
 
 import os
 import sys
+import socket
 import argparse
 import subprocess
+import json
 import datetime
-import shutil
+import tempfile
+import threading
+from collections import namedtuple
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; renewals there just run without the lock
+    fcntl = None
+
+# cryptography is only needed to read certificate expiration dates, so it is imported
+# by load_cryptography the first time a certificate actually has to be parsed
+x509 = None
+default_backend = None
+
+# Terminal colors, left out when output goes to a log file or container log
+if sys.stdout.isatty():
+    RED, GREEN, YELLOW, CYAN, RESET = "\033[31m", "\033[32m", "\033[33m", "\033[36m", "\033[0m"
+else:
+    RED = GREEN = YELLOW = CYAN = RESET = ""
+
+# datetime.UTC only exists on Python 3.11+
+UTC = getattr(datetime, 'UTC', None)
+
 # Ensure the generate_env package is in the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import needed functions from our package
 try:
-    from generate_env.utils.file_operations import ensure_directory
     from generate_env.certificate_manager import copy_letsencrypt_certs_for_nginx, generate_self_signed_certificate
 except ImportError as e:
-    print(f"\033[31mError importing from generate_env: {e}\033[0m")
-    print(f"\033[31mCurrent sys.path: {sys.path}\033[0m")
+    print(f"{RED}Error importing from generate_env: {e}{RESET}")
+    print(f"{RED}Current sys.path: {sys.path}{RESET}")
     # Continue with placeholder functions to avoid complete failure
-    def ensure_directory(dir_path):
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
-        return True
-    
     def copy_letsencrypt_certs_for_nginx(domain):
-        print("\033[33mWarning: copy_letsencrypt_certs_for_nginx is a placeholder\033[0m")
+        print(f"{YELLOW}Warning: copy_letsencrypt_certs_for_nginx is a placeholder{RESET}")
         return True
     
-    def generate_self_signed_certificate(args):
-        print("\033[33mWarning: generate_self_signed_certificate is a placeholder\033[0m")
+    def create_self_signed_pem(domain, certs_dir, reuse_key=False):
+        """Create a self-signed key and certificate for domain, returned as PEM bytes."""
+        subject = f"/CN={domain}/O=Clio-Logging/C=US"
+        try:
+            from cryptography import x509
+            from cryptography.x509.oid import NameOID
+            from cryptography.hazmat.primitives import hashes, serialization
+            from cryptography.hazmat.primitives.asymmetric import rsa
+        except ImportError:
+            # No cryptography package either, so fall back to the openssl CLI.
+            # server.* share inodes with the other services' files, so openssl writes
+            # into a temp directory and the caller renames the results into place.
+            key_path = certs_dir / "server.key"
+            with tempfile.TemporaryDirectory(dir=certs_dir, prefix=".openssl-") as work_dir:
+                new_key_path = Path(work_dir) / "server.key"
+                new_cert_path = Path(work_dir) / "server.crt"
+                # A single openssl run signs the certificate, creating the key too unless
+                # the existing one is kept
+                if reuse_key and key_path.exists():
+                    key_args = ["-new", "-key", str(key_path)]
+                else:
+                    key_args = ["-newkey", "rsa:2048", "-keyout", str(new_key_path)]
+                subprocess.run([
+                    "openssl", "req", 
+                    "-x509", 
+                    *key_args,
+                    "-nodes", 
+                    "-sha256", 
+                    "-days", "365", 
+                    "-out", str(new_cert_path),
+                    "-subj", subject
+                ], check=True, capture_output=True)
+                if not new_key_path.exists():
+                    new_key_path = key_path
+                return new_key_path.read_bytes(), new_cert_path.read_bytes()
+        
+        # Generate the key and certificate in-process instead of forking openssl.
+        # A renewal keeps the existing key and only re-signs the certificate.
+        private_key = None
+        if reuse_key:
+            try:
+                private_key = serialization.load_pem_private_key(
+                    (certs_dir / "server.key").read_bytes(), password=None)
+            except (OSError, ValueError, TypeError):
+                pass
+        if not isinstance(private_key, rsa.RSAPrivateKey):
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([
+            x509.NameAttribute(NameOID.COMMON_NAME, domain),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Clio-Logging"),
+            x509.NameAttribute(NameOID.COUNTRY_NAME, "US")
+        ])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + datetime.timedelta(days=365))
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .sign(private_key, hashes.SHA256())
+        )
+        key_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        return key_pem, cert.public_bytes(serialization.Encoding.PEM)
+    
+    def generate_self_signed_certificate(args, reuse_key=False):
+        print(f"{YELLOW}Warning: generate_self_signed_certificate is a placeholder{RESET}")
         try:
             # Basic implementation to generate a self-signed certificate
-            certs_dir = Path("/app/certs")
-            certs_dir.mkdir(exist_ok=True)
+            certs_dir = Path(CERTS_DIR)
+            ensure_certs_dir()
             
-            # Use openssl to generate a self-signed certificate
             domain = args.hostname if hasattr(args, 'hostname') else 'localhost'
-            subject = f"/CN={domain}/O=Clio-Logging/C=US"
             
-            print(f"\033[36mGenerating self-signed certificate for {domain}...\033[0m")
+            print(f"{CYAN}Generating self-signed certificate for {domain}...{RESET}")
             
-            # Generate private key
-            key_path = certs_dir / "server.key"
-            subprocess.run([
-                "openssl", "genrsa", 
-                "-out", str(key_path), 
-                "2048"
-            ], check=True, capture_output=True)
-            
-            # Generate certificate
-            cert_path = certs_dir / "server.crt"
-            subprocess.run([
-                "openssl", "req", 
-                "-x509", 
-                "-new", 
-                "-nodes", 
-                "-key", str(key_path),
-                "-sha256", 
-                "-days", "365", 
-                "-out", str(cert_path),
-                "-subj", subject
-            ], check=True, capture_output=True)
+            key_pem, cert_pem = create_self_signed_pem(domain, certs_dir, reuse_key)
             
-            # Copy to backend.crt and other service certs
-            shutil.copy(cert_path, certs_dir / "backend.crt")
-            shutil.copy(key_path, certs_dir / "backend.key")
+            # Server and backend certs are always replaced; redis and db certs only if they don't exist
+            services = ["server", "backend"]
+            for service in ["redis", "db"]:
+                if not (certs_dir / f"{service}.crt").exists():
+                    services.append(service)
             
-            # Create redis certs if they don't exist
-            if not (certs_dir / "redis.crt").exists():
-                shutil.copy(cert_path, certs_dir / "redis.crt")
-                shutil.copy(key_path, certs_dir / "redis.key")
-            
-            # Create db certs if they don't exist
-            if not (certs_dir / "db.crt").exists():
-                shutil.copy(cert_path, certs_dir / "db.crt")
-                shutil.copy(key_path, certs_dir / "db.key")
+            # Write the server files once, then hard link the other services to them so
+            # no bytes are copied. Each file is created under a temp name and renamed into
+            # place, so services never read a half-written certificate, and the new files
+            # get fresh inodes; older links (e.g. kept redis/db certs) keep their contents.
+            for extension, pem in (("crt", cert_pem), ("key", key_pem)):
+                server_path = certs_dir / f"server.{extension}"
+                for service in services:
+                    target_path = certs_dir / f"{service}.{extension}"
+                    temp_path = certs_dir / f".{service}.{extension}.tmp"
+                    try:
+                        os.unlink(temp_path)
+                    except FileNotFoundError:
+                        pass
+                    if service == "server":
+                        temp_path.write_bytes(pem)
+                    else:
+                        try:
+                            os.link(server_path, temp_path)
+                        except OSError:
+                            # Hard links aren't supported here (e.g. Windows or some volume mounts)
+                            temp_path.write_bytes(pem)
+                    os.replace(temp_path, target_path)
                 
-            print(f"\033[32mGenerated self-signed certificate successfully\033[0m")
+            print(f"{GREEN}Generated self-signed certificate successfully{RESET}")
             return True
         except Exception as e:
-            print(f"\033[31mError generating self-signed certificate: {e}\033[0m")
+            print(f"{RED}Error generating self-signed certificate: {e}{RESET}")
             return False
 
+def is_ip_address(hostname):
+    """Check if the hostname is a dotted-quad IPv4 address."""
+    # Rejects out-of-range octets such as 999.1.1.1
+    try:
+        socket.inet_pton(socket.AF_INET, hostname)
+    except (OSError, ValueError):
+        return False
+    return True
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -113,65 +205,216 @@ def parse_arguments():
     
     # If both --letsencrypt and --self-signed-only are specified, prioritize self-signed
     if args.letsencrypt and args.self_signed_only:
-        print("\033[33mWarning: Both --letsencrypt and --self-signed-only specified.\033[0m")
-        print("\033[33mPrioritizing --self-signed-only flag.\033[0m")
+        print(f"{YELLOW}Warning: Both --letsencrypt and --self-signed-only specified.{RESET}")
+        print(f"{YELLOW}Prioritizing --self-signed-only flag.{RESET}")
         args.letsencrypt = False
     
     # If --letsencrypt-only is specified, make sure we have required parameters
     if args.letsencrypt_only or args.letsencrypt:
         if not args.email:
-            print("\033[33mWarning: --email is required for Let's Encrypt renewal but wasn't provided.\033[0m")
-            print("\033[33mLet's Encrypt renewal may fail without a valid email address.\033[0m")
+            print(f"{YELLOW}Warning: --email is required for Let's Encrypt renewal but wasn't provided.{RESET}")
+            print(f"{YELLOW}Let's Encrypt renewal may fail without a valid email address.{RESET}")
     
     # Add hostname property which may be used by certificate functions
     args.hostname = args.domain
     
     # Determine if hostname is an IP address
-    import re
-    args.is_ip_address = bool(re.match(r'^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$', args.domain))
+    args.is_ip_address = is_ip_address(args.domain)
     
     return args
     
+# Result of check_self_signed_expiration. expires_at and days_left are None when the
+# certificate couldn't be read (needs_renewal is then True to be safe) or when openssl
+# did the check because cryptography isn't installed.
+ExpirationInfo = namedtuple('ExpirationInfo', ['needs_renewal', 'expires_at', 'days_left'])
+
+# Expiration dates of certificates already parsed, keyed by path. Each entry
+# remembers the file's mtime and size so a rewritten certificate is parsed again.
+EXPIRATION_CACHE = {}
+EXPIRATION_CACHE_SIZE = 64
+
+# Both renewals may check certificates at the same time on separate threads, and
+# they share the cache dict and the cache file
+EXPIRATION_CACHE_LOCK = threading.Lock()
+
+# The same entries are also saved in this file in the certs directory, keyed by absolute
+# path, so a cron run (a new process every time) can skip parsing an unchanged certificate
+# too. It is never written next to the certificate itself, which may be certbot's own
+# live directory.
+EXPIRATION_CACHE_FILE = ".expiry.cache"
+
+def read_saved_expiration(cert_path):
+    """Return the (mtime_ns, size, expiration date) saved for cert_path, or None."""
+    cache_path = os.path.join(CERTS_DIR, EXPIRATION_CACHE_FILE)
+    try:
+        with open(cache_path) as f:
+            mtime_ns, size, expires_at = json.load(f)[os.path.abspath(cert_path)]
+        return mtime_ns, size, datetime.datetime.fromisoformat(expires_at)
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+def save_expiration(cert_path, entry):
+    """Save the EXPIRATION_CACHE entry for cert_path to the cache file."""
+    cache_path = os.path.join(CERTS_DIR, EXPIRATION_CACHE_FILE)
+    try:
+        with open(cache_path) as f:
+            saved = json.load(f)
+        if not isinstance(saved, dict):
+            saved = {}
+    except (OSError, ValueError):
+        saved = {}
+    
+    mtime_ns, size, expires_at = entry
+    saved[os.path.abspath(cert_path)] = [mtime_ns, size, expires_at.isoformat()]
+    try:
+        write_file_atomically(cache_path, json.dumps(saved))
+    except Exception:
+        # The cache is only a shortcut: a failed write (e.g. a read-only certs
+        # directory) just means the next run parses again, and never changes the verdict
+        pass
+
+def load_cryptography():
+    """Import the cryptography modules used to read certificates, once."""
+    global x509, default_backend
+    if x509 is None:
+        from cryptography import x509 as x509_module
+        from cryptography.hazmat.backends import default_backend as backend
+        x509, default_backend = x509_module, backend
+
+def check_expiration_with_openssl(cert_path, days_threshold):
+    """Check expiration with `openssl x509 -checkend`, for systems without cryptography."""
+    # -checkend exits non-zero if the certificate expires within the given seconds
+    # (or can't be read); no date parsing needed, so no expiration date to report
+    result = subprocess.run([
+        "openssl", "x509",
+        "-in", str(cert_path),
+        "-noout",
+        "-checkend", str(days_threshold * 86400)
+    ], capture_output=True)
+    return ExpirationInfo(result.returncode != 0, None, None)
+
 def check_self_signed_expiration(cert_path, days_threshold=30):
-    """Check if a self-signed certificate is nearing expiration."""
+    """Check if a self-signed certificate is nearing expiration.
+    
+    Returns an ExpirationInfo so callers can report the expiration date without
+    parsing the certificate again.
+    """
     try:
-        # Import these inside the function to handle import errors gracefully
-        from cryptography import x509
-        from cryptography.hazmat.backends import default_backend
-        import datetime
+        cache_key = os.path.abspath(cert_path)
+        cert_stat = os.stat(cert_path)
+        with EXPIRATION_CACHE_LOCK:
+            cached = EXPIRATION_CACHE.get(cache_key) or read_saved_expiration(cache_key)
         
-        with open(cert_path, 'rb') as f:
-            cert_data = f.read()
+        if cached is not None and cached[:2] == (cert_stat.st_mtime_ns, cert_stat.st_size):
+            # The file hasn't changed since it was last parsed
+            expiration_date = cached[2]
+        else:
+            try:
+                load_cryptography()
+            except ImportError:
+                # Without cryptography, let openssl answer the yes/no question itself
+                return check_expiration_with_openssl(cert_path, days_threshold)
             
-        cert = x509.load_pem_x509_certificate(cert_data, default_backend())
-        
-        # Handle deprecated properties with try/except
-        try:
-            # Try to use the new UTC-aware method first
-            expiration_date = cert.not_valid_after_utc
-        except AttributeError:
-            # Fall back to the deprecated method with a warning
-            expiration_date = cert.not_valid_after
-            print("\033[33mWarning: Using deprecated certificate property. Update cryptography package.\033[0m")
+            with open(cert_path, 'rb') as f:
+                cert_data = f.read()
+                
+            cert = x509.load_pem_x509_certificate(cert_data, default_backend())
+            
+            # Handle deprecated properties with try/except
+            try:
+                # Try to use the new UTC-aware method first
+                expiration_date = cert.not_valid_after_utc
+            except AttributeError:
+                # Fall back to the deprecated method with a warning
+                expiration_date = cert.not_valid_after
+                print(f"{YELLOW}Warning: Using deprecated certificate property. Update cryptography package.{RESET}")
+            
+            with EXPIRATION_CACHE_LOCK:
+                # Drop the oldest entry once the cache is full
+                EXPIRATION_CACHE.pop(cache_key, None)
+                if len(EXPIRATION_CACHE) >= EXPIRATION_CACHE_SIZE:
+                    del EXPIRATION_CACHE[next(iter(EXPIRATION_CACHE))]
+                EXPIRATION_CACHE[cache_key] = (cert_stat.st_mtime_ns, cert_stat.st_size, expiration_date)
+                save_expiration(cache_key, EXPIRATION_CACHE[cache_key])
         
         # Use timezone-aware datetime for comparison
-        try:
+        if UTC is not None:
             # Try to use the new timezone-aware method
-            current_time = datetime.datetime.now(datetime.UTC)
-        except AttributeError:
+            current_time = datetime.datetime.now(UTC)
+        else:
             # Fall back to the old method
             current_time = datetime.datetime.utcnow()
-            print("\033[33mWarning: Using deprecated datetime method. Update your Python version.\033[0m")
+            print(f"{YELLOW}Warning: Using deprecated datetime method. Update your Python version.{RESET}")
         
         # Calculate the time difference and convert to days
         time_diff = expiration_date - current_time
         remaining_days = time_diff.days
         
-        return remaining_days <= days_threshold
+        return ExpirationInfo(remaining_days <= days_threshold, expiration_date, remaining_days)
     except Exception as e:
-        print(f"\033[31mError checking certificate expiration: {str(e)}\033[0m")
+        print(f"{RED}Error checking certificate expiration: {str(e)}{RESET}")
         # If we can't check, assume renewal is needed to be safe
-        return True
+        return ExpirationInfo(True, None, None)
+
+# Certificate directory in the container, and whether this run has already made sure it exists
+CERTS_DIR = "/app/certs"
+certs_dir_ready = False
+
+def ensure_certs_dir():
+    """Create the container certificate directory if needed, checking at most once per run."""
+    global certs_dir_ready
+    if certs_dir_ready:
+        return
+    try:
+        os.makedirs(CERTS_DIR)
+        print(f"{RED}Certificate directory not found. Created {CERTS_DIR}{RESET}")
+    except FileExistsError:
+        pass
+    certs_dir_ready = True
+
+def acquire_renewal_lock():
+    """Take the renewal lock, returning its open file descriptor.
+    
+    Returns None if another renewal already holds the lock. If the lock file can't be
+    created at all (e.g. no fcntl or no writable certs directory), renewal goes ahead
+    unlocked and -1 is returned.
+    """
+    if fcntl is None:
+        return -1
+    try:
+        ensure_certs_dir()
+        lock_fd = os.open(os.path.join(CERTS_DIR, ".renew.lock"), os.O_CREAT | os.O_RDWR, 0o600)
+    except OSError as e:
+        print(f"{YELLOW}Warning: Could not create renewal lock file: {e}{RESET}")
+        return -1
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(lock_fd)
+        return None
+    # Held until the process exits
+    return lock_fd
+
+def write_file_atomically(file_path, content):
+    """Write a text file by renaming a finished temp file into place."""
+    # Readers (e.g. the host watching for flag files) never see a half-written file,
+    # even if the container is killed mid-write
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as temp_file:
+            # mkstemp creates the file as 0600; keep it readable like a normal open() would
+            if os.name == 'posix':
+                os.fchmod(temp_file.fileno(), 0o644)
+            temp_file.write(content)
+        if os.name != 'posix':
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
 
 def renew_certificates(args, force=False):
     """Renew Let's Encrypt certificates.
@@ -179,121 +422,154 @@ def renew_certificates(args, force=False):
     Note: In container environment, we can't directly restart services.
     Instead, we'll write a flag file that can be monitored by the host system.
     """
+    global certs_dir_ready
+    
     domain = args.domain
     email = args.email
     
-    print(f"\033[36mRenewing Let's Encrypt certificates for {domain}...\033[0m")
+    print(f"{CYAN}Renewing Let's Encrypt certificates for {domain}...{RESET}")
     
     if not email:
-        print("\033[33mWarning: No email address provided for Let's Encrypt renewal.\033[0m")
-        print("\033[33mUsing a valid email is required for Let's Encrypt notifications.\033[0m")
+        print(f"{YELLOW}Warning: No email address provided for Let's Encrypt renewal.{RESET}")
+        print(f"{YELLOW}Using a valid email is required for Let's Encrypt notifications.{RESET}")
     
     # In a container, we likely don't have direct access to certbot, so we'll need to adapt
-    print("\033[33mNote: Let's Encrypt renewal in container environment is limited.\033[0m")
-    print("\033[33mConsider running renewal on the host system instead.\033[0m")
+    print(f"{YELLOW}Note: Let's Encrypt renewal in container environment is limited.{RESET}")
+    print(f"{YELLOW}Consider running renewal on the host system instead.{RESET}")
     
     try:
         # Check if Let's Encrypt certificates already exist in mounted volume
+        certs_dir = CERTS_DIR
         lets_encrypt_paths = [
-            f"/app/certs/letsencrypt-fullchain.pem",
-            f"/app/certs/fullchain.pem",
+            f"{certs_dir}/letsencrypt-fullchain.pem",
+            f"{certs_dir}/fullchain.pem",
             f"/etc/letsencrypt/live/{domain}/fullchain.pem"
         ]
         
+        # List the mounted certs directory once instead of probing each path in it
+        try:
+            with os.scandir(certs_dir) as entries:
+                certs_dir_names = {entry.name for entry in entries}
+            # The listing proves the directory exists, so it never needs creating
+            certs_dir_ready = True
+        except OSError:
+            certs_dir_names = set()
+        
         cert_exists = False
         existing_cert_path = None
         
         for le_path in lets_encrypt_paths:
-            if os.path.exists(le_path):
+            le_dir, le_name = os.path.split(le_path)
+            if le_dir == certs_dir:
+                found = le_name in certs_dir_names
+            else:
+                found = os.path.exists(le_path)
+            if found:
                 cert_exists = True
                 existing_cert_path = le_path
-                print(f"\033[32mFound existing Let's Encrypt certificate at {le_path}\033[0m")
+                print(f"{GREEN}Found existing Let's Encrypt certificate at {le_path}{RESET}")
                 break
                 
         if not cert_exists:
-            print(f"\033[33mNo existing Let's Encrypt certificates found. Checking paths:\033[0m")
+            print(f"{YELLOW}No existing Let's Encrypt certificates found. Checking paths:{RESET}")
             for path in lets_encrypt_paths:
-                print(f"\033[33m  - {path} (not found)\033[0m")
+                print(f"{YELLOW}  - {path} (not found){RESET}")
             
             # Create a flag file to signal that Let's Encrypt certificates need to be installed
-            target_dir = "/app/certs"
-            os.makedirs(target_dir, exist_ok=True)
+            target_dir = CERTS_DIR
+            ensure_certs_dir()
             
             # Include email in the flag file for outside use
             email_info = f" (email: {email})" if email else ""
             
-            with open(f"{target_dir}/LETSENCRYPT_NEEDED", "w") as flag_file:
-                flag_file.write(f"Let's Encrypt certificates needed for {domain}{email_info}")
+            write_file_atomically(f"{target_dir}/LETSENCRYPT_NEEDED",
+                            f"Let's Encrypt certificates needed for {domain}{email_info}")
                 
-            print(f"\033[33mCreated flag file to request Let's Encrypt certificate installation\033[0m")
+            print(f"{YELLOW}Created flag file to request Let's Encrypt certificate installation{RESET}")
             return False
         
+        # Nothing to deploy if the Nginx copy is at least as new as the live certificate
+        # and the certificate isn't close to expiring. A recent mtime on the live file means
+        # certbot just renewed it, so in that case the copy below still has to run.
+        if not force:
+            try:
+                live_mtime = os.stat(f"/etc/letsencrypt/live/{domain}/fullchain.pem").st_mtime_ns
+                nginx_mtime = os.stat("certs/letsencrypt-fullchain.pem").st_mtime_ns
+            except OSError:
+                pass
+            else:
+                if nginx_mtime >= live_mtime and not check_self_signed_expiration(existing_cert_path).needs_renewal:
+                    print(f"{GREEN}Nginx already has the current Let's Encrypt certificate. No renewal needed.{RESET}")
+                    return True
+        
         # Try a simple certificate copy operation (assuming certs are mounted)
-        print("\033[36mTrying to update Nginx certificates...\033[0m")
+        print(f"{CYAN}Trying to update Nginx certificates...{RESET}")
         cert_updated = False
         
         try:
-            print("\033[36mCopying Let's Encrypt certificates for Nginx proxy...\033[0m")
+            print(f"{CYAN}Copying Let's Encrypt certificates for Nginx proxy...{RESET}")
             cert_updated = copy_letsencrypt_certs_for_nginx(domain)
         except Exception as e:
-            print(f"\033[31mError copying Let's Encrypt certificates: {str(e)}\033[0m")
+            print(f"{RED}Error copying Let's Encrypt certificates: {str(e)}{RESET}")
             cert_updated = False
         
         if cert_updated:
-            print("\033[32mNginx certificates updated successfully\033[0m")
+            print(f"{GREEN}Nginx certificates updated successfully{RESET}")
             
             # Create a flag file to signal the host system that certificates have been renewed
-            with open("/app/certs/CERTS_RENEWED", "w") as flag_file:
-                flag_file.write(f"Let's Encrypt certificates renewed at {datetime.datetime.now().isoformat()}")
+            write_file_atomically(f"{CERTS_DIR}/CERTS_RENEWED",
+                            f"Let's Encrypt certificates renewed at {datetime.datetime.now().isoformat()}")
             
-            print("\033[33mCreated renewal flag file. Host system should restart services.\033[0m")
+            print(f"{YELLOW}Created renewal flag file. Host system should restart services.{RESET}")
             return True
         else:
-            print("\033[31mFailed to update Nginx certificates\033[0m")
+            print(f"{RED}Failed to update Nginx certificates{RESET}")
             return False
     except Exception as e:
-        print(f"\033[31mError during certificate renewal: {str(e)}\033[0m")
+        print(f"{RED}Error during certificate renewal: {str(e)}{RESET}")
         return False
 
 def renew_self_signed_certificates(domain, no_confirm=False, force=False):
     """Renew self-signed certificates if they are nearing expiration or if forced."""
-    print(f"\033[36mChecking self-signed certificates for renewal...\033[0m")
+    print(f"{CYAN}Checking self-signed certificates for renewal...{RESET}")
     
     # Paths to certificate files - using /app/certs as the base path in container
-    certs_dir = Path("/app/certs")
+    certs_dir = Path(CERTS_DIR)
     server_cert = certs_dir / "server.crt"
     
-    # Check if certificate directory exists
-    if not certs_dir.exists():
-        print("\033[31mCertificate directory not found. Creating it...\033[0m")
-        ensure_directory(certs_dir)
+    # Create the certificate directory if it doesn't exist
+    ensure_certs_dir()
     
     # Check if main certificate exists and needs renewal
     needs_renewal = False
     if not server_cert.exists():
-        print("\033[33mSelf-signed certificate not found. Generating new certificate...\033[0m")
+        print(f"{YELLOW}Self-signed certificate not found. Generating new certificate...{RESET}")
         needs_renewal = True
     else:
         if force:
-            print("\033[33mForce renewal requested. Renewing self-signed certificates regardless of expiration.\033[0m")
+            print(f"{YELLOW}Force renewal requested. Renewing self-signed certificates regardless of expiration.{RESET}")
             needs_renewal = True
         else:
             try:
-                needs_renewal = check_self_signed_expiration(server_cert)
+                expiration = check_self_signed_expiration(server_cert)
+                needs_renewal = expiration.needs_renewal
                 if needs_renewal:
-                    print("\033[33mCertificate expiring soon. Renewal needed.\033[0m")
+                    print(f"{YELLOW}Certificate expiring soon. Renewal needed.{RESET}")
+                elif expiration.expires_at is None:
+                    print(f"{GREEN}Self-signed certificates are still valid.{RESET}")
                 else:
-                    print("\033[32mSelf-signed certificates are still valid.\033[0m")
+                    print(f"{GREEN}Self-signed certificates are still valid "
+                          f"(expires {expiration.expires_at:%Y-%m-%d}, {expiration.days_left} days left).{RESET}")
             except Exception as e:
-                print(f"\033[31mError checking certificate expiration: {e}\033[0m")
-                print("\033[33mAssuming renewal is needed due to error\033[0m")
+                print(f"{RED}Error checking certificate expiration: {e}{RESET}")
+                print(f"{YELLOW}Assuming renewal is needed due to error{RESET}")
                 needs_renewal = True
     
     if needs_renewal or force:
         if not needs_renewal and force:
-            print("\033[36mForcing renewal of self-signed certificates as requested...\033[0m")
+            print(f"{CYAN}Forcing renewal of self-signed certificates as requested...{RESET}")
         else:
-            print("\033[36mSelf-signed certificates need renewal. Generating new certificates...\033[0m")
+            print(f"{CYAN}Self-signed certificates need renewal. Generating new certificates...{RESET}")
         
         # Use existing function from generate_env.certificate_manager
         try:
@@ -312,92 +588,111 @@ def renew_self_signed_certificates(domain, no_confirm=False, force=False):
                 parsed_args.hostname = domain
                 args = parsed_args
             except Exception as e:
-                print(f"\033[33mUsing minimal args due to error: {e}\033[0m")
+                print(f"{YELLOW}Using minimal args due to error: {e}{RESET}")
             
             # Generate new self-signed certificates
-            success = generate_self_signed_certificate(args)
+            # Keep the existing private key; only the certificate needs re-signing
+            success = generate_self_signed_certificate(args, reuse_key=True)
             
             if success:
-                print("\033[32mSelf-signed certificates renewed successfully\033[0m")
+                print(f"{GREEN}Self-signed certificates renewed successfully{RESET}")
                 
                 # Create a flag file to signal the host system
-                with open("/app/certs/CERTS_RENEWED", "w") as flag_file:
-                    flag_file.write(f"Self-signed certificates renewed at {datetime.datetime.now().isoformat()}")
+                write_file_atomically(f"{CERTS_DIR}/CERTS_RENEWED",
+                                f"Self-signed certificates renewed at {datetime.datetime.now().isoformat()}")
                 
-                print("\033[33mCreated renewal flag file. Host system should restart services.\033[0m")
+                print(f"{YELLOW}Created renewal flag file. Host system should restart services.{RESET}")
                 return True
             else:
-                print("\033[31mFailed to renew self-signed certificates\033[0m")
+                print(f"{RED}Failed to renew self-signed certificates{RESET}")
                 return False
         except Exception as e:
-            print(f"\033[31mError during self-signed certificate renewal: {e}\033[0m")
+            print(f"{RED}Error during self-signed certificate renewal: {e}{RESET}")
             return False
     else:
-        print("\033[32mSelf-signed certificates are still valid. No renewal needed.\033[0m")
-        print("\033[33mUse --force flag to renew anyway if desired.\033[0m")
+        print(f"{GREEN}Self-signed certificates are still valid. No renewal needed.{RESET}")
+        print(f"{YELLOW}Use --force flag to renew anyway if desired.{RESET}")
         return True
 
 def main():
     """Main entry point for certificate renewal."""
     # Print environment information for debugging
-    print(f"\033[36mPython version: {sys.version}\033[0m")
-    print(f"\033[36mCurrent directory: {os.getcwd()}\033[0m")
-    print(f"\033[36mScript directory: {os.path.dirname(os.path.abspath(__file__))}\033[0m")
+    print(f"{CYAN}Python version: {sys.version}{RESET}")
+    print(f"{CYAN}Current directory: {os.getcwd()}{RESET}")
+    print(f"{CYAN}Script directory: {os.path.dirname(os.path.abspath(__file__))}{RESET}")
     
     try:
         args = parse_arguments()
         
+        # A cron run and a manual run at the same time would both rewrite the same
+        # certificate files, so only one renewal may run at a time
+        if acquire_renewal_lock() is None:
+            print(f"{YELLOW}Another certificate renewal is already in progress. Skipping this run.{RESET}")
+            return 0
+        
         letsencrypt_success = True
         self_signed_success = True
         
-        # Run Let's Encrypt renewal if requested
-        if not args.self_signed_only and (args.letsencrypt or args.letsencrypt_only):
-            print("\033[36mProcessing Let's Encrypt certificate renewal...\033[0m")
-            letsencrypt_success = renew_certificates(args, args.force)
+        renew_letsencrypt = not args.self_signed_only and (args.letsencrypt or args.letsencrypt_only)
+        renew_self_signed = not args.letsencrypt_only
         
-        # Run self-signed certificate renewal if requested
-        if not args.letsencrypt_only:
-            print("\033[36mProcessing self-signed certificate renewal...\033[0m")
+        if renew_letsencrypt and renew_self_signed:
+            # The two renewals write different certificate files, so run them side by side
+            print(f"{CYAN}Processing Let's Encrypt and self-signed certificate renewal...{RESET}")
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                letsencrypt_future = executor.submit(renew_certificates, args, args.force)
+                self_signed_future = executor.submit(
+                    renew_self_signed_certificates, args.domain, args.no_confirm, args.force)
+                letsencrypt_success = letsencrypt_future.result()
+                self_signed_success = self_signed_future.result()
+        elif renew_letsencrypt:
+            # Run Let's Encrypt renewal if requested
+            print(f"{CYAN}Processing Let's Encrypt certificate renewal...{RESET}")
+            letsencrypt_success = renew_certificates(args, args.force)
+        elif renew_self_signed:
+            # Run self-signed certificate renewal if requested
+            print(f"{CYAN}Processing self-signed certificate renewal...{RESET}")
             self_signed_success = renew_self_signed_certificates(args.domain, args.no_confirm, args.force)
         
         # Handle combination of success/failure
         if letsencrypt_success and self_signed_success:
-            print("\033[32m===== Certificate Renewal Complete =====\033[0m")
-            print(f"\033[32mAll certificates for {args.domain} have been checked/renewed\033[0m")
-            print("\033[32m=========================================\033[0m")
+            print(f"{GREEN}===== Certificate Renewal Complete ====={RESET}")
+            print(f"{GREEN}All certificates for {args.domain} have been checked/renewed{RESET}")
+            print(f"{GREEN}========================================={RESET}")
             return 0
         elif letsencrypt_success and args.self_signed_only:
-            print("\033[32m===== Certificate Renewal Complete =====\033[0m")
-            print(f"\033[32mLet's Encrypt certificates renewed successfully\033[0m")
-            print("\033[32m=========================================\033[0m")
+            print(f"{GREEN}===== Certificate Renewal Complete ====={RESET}")
+            print(f"{GREEN}Let's Encrypt certificates renewed successfully{RESET}")
+            print(f"{GREEN}========================================={RESET}")
             return 0
         elif self_signed_success and args.letsencrypt_only:
-            print("\033[32m===== Certificate Renewal Complete =====\033[0m")
-            print(f"\033[32mSelf-signed certificates checked/renewed successfully\033[0m")
-            print("\033[32m=========================================\033[0m")
+            print(f"{GREEN}===== Certificate Renewal Complete ====={RESET}")
+            print(f"{GREEN}Self-signed certificates checked/renewed successfully{RESET}")
+            print(f"{GREEN}========================================={RESET}")
             return 0
         elif letsencrypt_success:
-            print("\033[33m===== Certificate Renewal Partially Complete =====\033[0m")
-            print(f"\033[32mLet's Encrypt certificates renewed successfully\033[0m")
-            print(f"\033[31mSelf-signed certificate renewal failed\033[0m")
-            print("\033[33m==============================================\033[0m")
+            print(f"{YELLOW}===== Certificate Renewal Partially Complete ====={RESET}")
+            print(f"{GREEN}Let's Encrypt certificates renewed successfully{RESET}")
+            print(f"{RED}Self-signed certificate renewal failed{RESET}")
+            print(f"{YELLOW}=============================================={RESET}")
             # Return 0 instead of 1 to avoid crashing the process
             return 0
         elif self_signed_success:
-            print("\033[33m===== Certificate Renewal Partially Complete =====\033[0m")
-            print(f"\033[31mLet's Encrypt certificate renewal failed\033[0m")
-            print(f"\033[32mSelf-signed certificates checked/renewed successfully\033[0m")
-            print("\033[33m==============================================\033[0m")
+            print(f"{YELLOW}===== Certificate Renewal Partially Complete ====={RESET}")
+            print(f"{RED}Let's Encrypt certificate renewal failed{RESET}")
+            print(f"{GREEN}Self-signed certificates checked/renewed successfully{RESET}")
+            print(f"{YELLOW}=============================================={RESET}")
             # Return 0 instead of 1 to avoid crashing the process
             return 0
         else:
-            print("\033[31m===== Certificate Renewal Failed =====\033[0m")
-            print("\033[31mBoth certificate renewal processes failed\033[0m")
-            print("\033[31m======================================\033[0m")
+            print(f"{RED}===== Certificate Renewal Failed ====={RESET}")
+            print(f"{RED}Both certificate renewal processes failed{RESET}")
+            print(f"{RED}======================================{RESET}")
             # Return 0 instead of 1 to avoid crashing the process
             return 0
     except Exception as e:
-        print(f"\033[31mUnexpected error during certificate renewal: {e}\033[0m")
+        print(f"{RED}Unexpected error during certificate renewal: {e}{RESET}")
         # Return 0 instead of letting the exception propagate
         return 0
 
@@ -406,6 +701,6 @@ if __name__ == "__main__":
         exit_code = main()
         sys.exit(exit_code)
     except Exception as e:
-        print(f"\033[31mCritical error in renewal script: {e}\033[0m")
+        print(f"{RED}Critical error in renewal script: {e}{RESET}")
         # Always exit with success to avoid error in container
         sys.exit(0)
\ No newline at end of file